@@ -8,14 +8,23 @@ This script demonstrates how to set up continuous email monitoring:
 4. Send alerts
 """
 
+import os
 import sys
+import asyncio
 import yaml
 import time
 import json
+import msgpack
 import schedule
+import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.email_analyzer import EmailAnalyzer
@@ -24,48 +33,163 @@ from src.pattern_detector import PatternDetector
 from src.filter_suggester import FilterSuggester
 
 # State file to track last analysis
-STATE_FILE = 'data/monitor_state.json'
+STATE_FILE = 'data/monitor_state.msgpack'
+# JSON state written by earlier versions, read once for migration
+LEGACY_STATE_FILE = 'data/monitor_state.json'
+# Reused across cycles instead of building a packer on every save
+_STATE_PACKER = msgpack.Packer(use_bin_type=True)
+
+# Rolling baseline used for z-score anomaly detection
+HISTORY_METRICS = ('avg_per_day', 'weekend_pct', 'night_pct')
+HISTORY_SIZE = 30  # Number of past cycles kept in the state file
+MIN_HISTORY = 5  # Cycles needed before z-scores replace the fixed thresholds
+Z_THRESHOLD = 3.0
+# Floor for the standard deviation (1 email/day, 1 percentage point) so a
+# perfectly flat history does not turn tiny changes into huge z-scores
+MIN_SIGMA = 1.0
+
+# Fixed thresholds (percentages) used alongside the rolling baseline
+VOLUME_INCREASE_PCT = 50
+SENDER_DOMINANCE_PCT = 30
+WEEKEND_PCT = 40
+NIGHT_PCT = 25
+
+# Alert formatting, built once at import time
+_SEVERITY_EMOJI = {'high': '🔴', 'medium': '🟡', 'low': '🔵'}
+_ALERT_BANNER = "⚠️ " * 20
+
+# Authenticated connector and analyzer reused across cycles, keyed by config id
+_CLIENTS = {}
+
+def _setup(config):
+    """Return a (connector, analyzer) pair, authenticating only when needed."""
+    clients = _CLIENTS.get(id(config))
+    if clients is not None:
+        connector = clients[0]
+        # The client library refreshes expired tokens on its own; only a token
+        # that can no longer be refreshed needs the full authenticate() path
+        if connector.creds and (connector.creds.valid or connector.creds.refresh_token):
+            return clients
+        _CLIENTS.pop(id(config), None)
+    
+    connector = GmailConnector(config=config)
+    if not connector.authenticate():
+        return None, None
+    
+    clients = (connector, EmailAnalyzer(config))
+    _CLIENTS[id(config)] = clients
+    return clients
+
+def _default_state():
+    """State used before the first cycle or when the state file is unreadable."""
+    return {
+        'last_analysis': None,
+        'last_email_count': 0,
+        'baseline_avg_per_day': 0
+    }
 
 def load_state():
     """Load monitoring state."""
     try:
-        with open(STATE_FILE, 'r') as f:
+        return msgpack.unpackb(Path(STATE_FILE).read_bytes(), raw=False)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring unreadable state file {STATE_FILE}: {e}")
+        return _default_state()
+    
+    try:
+        with open(LEGACY_STATE_FILE, 'r') as f:
             return json.load(f)
     except FileNotFoundError:
-        return {
-            'last_analysis': None,
-            'last_email_count': 0,
-            'baseline_avg_per_day': 0
-        }
+        return _default_state()
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring unreadable state file {LEGACY_STATE_FILE}: {e}")
+        return _default_state()
 
 def save_state(state):
-    """Save monitoring state."""
+    """Save monitoring state.
+    
+    Written to a temporary file and renamed over the old state, so a crash
+    mid-write never leaves a truncated state file behind.
+    """
     Path(STATE_FILE).parent.mkdir(parents=True, exist_ok=True)
-    with open(STATE_FILE, 'w') as f:
-        json.dump(state, f, indent=2)
+    tmp_file = STATE_FILE + '.tmp'
+    Path(tmp_file).write_bytes(_STATE_PACKER.pack(state))
+    os.replace(tmp_file, STATE_FILE)
+
+def current_metrics(results):
+    """Extract the metrics tracked in the rolling history."""
+    patterns = results.get('patterns', {}).get('temporal', {})
+    night_pct = patterns.get('time_of_day', {}).get('night', {}).get('percentage', 0)
+    return np.array([
+        results['basic_stats']['avg_per_day'],
+        results['temporal_patterns']['weekend_percentage'],
+        night_pct
+    ], dtype=float)
 
-def detect_anomalies(current_results, baseline):
-    """Detect anomalies in email patterns."""
+def history_zscores(history, current):
+    """Z-score each current metric against its rolling history.
+    
+    Returns a ``(z_scores, means)`` pair of arrays ordered like
+    HISTORY_METRICS, or ``(None, None)`` until at least MIN_HISTORY cycles
+    have been recorded.
+    """
+    if not history or len(history.get(HISTORY_METRICS[0], [])) < MIN_HISTORY:
+        return None, None
+    
+    past = np.array([history[m] for m in HISTORY_METRICS], dtype=float)
+    mean = past.mean(axis=1)
+    z = (current - mean) / np.maximum(past.std(axis=1), MIN_SIGMA)
+    return z, mean
+
+def update_history(state, current):
+    """Append the current metrics to the bounded rolling history."""
+    history = state.setdefault('history', {})
+    for metric, value in zip(HISTORY_METRICS, current.tolist()):
+        values = history.setdefault(metric, [])
+        values.append(value)
+        del values[:-HISTORY_SIZE]
+
+def detect_anomalies(current_results, baseline, current=None):
+    """Detect anomalies in email patterns.
+    
+    ``current`` may pass in metrics already extracted with current_metrics()
+    so the nested result lookups are only done once per cycle.
+    """
     anomalies = []
     
-    # Check for email volume spike
-    current_avg = current_results['basic_stats']['avg_per_day']
-    baseline_avg = baseline.get('baseline_avg_per_day', current_avg)
+    if current is None:
+        current = current_metrics(current_results)
+    current_avg, weekend_pct, night_pct = current.tolist()
+    z, mean = history_zscores(baseline.get('history'), current)
     
-    if baseline_avg > 0:
-        volume_increase = ((current_avg - baseline_avg) / baseline_avg) * 100
-        
-        if volume_increase > 50:  # 50% increase
+    # Check for email volume spike
+    if z is not None:
+        if abs(z[0]) > Z_THRESHOLD:
             anomalies.append({
-                'type': 'volume_spike',
+                'type': 'volume_spike' if z[0] > 0 else 'volume_drop',
                 'severity': 'high',
-                'message': f"Email volume increased by {volume_increase:.0f}%",
-                'details': f"From {baseline_avg:.1f} to {current_avg:.1f} emails/day"
+                'message': f"Email volume is {z[0]:+.1f} standard deviations from baseline",
+                'details': f"From {mean[0]:.1f} to {current_avg:.1f} emails/day"
             })
+    else:
+        baseline_avg = baseline.get('baseline_avg_per_day', current_avg)
+        
+        if baseline_avg > 0:
+            volume_increase = ((current_avg - baseline_avg) / baseline_avg) * 100
+            
+            if volume_increase > VOLUME_INCREASE_PCT:
+                anomalies.append({
+                    'type': 'volume_spike',
+                    'severity': 'high',
+                    'message': f"Email volume increased by {volume_increase:.0f}%",
+                    'details': f"From {baseline_avg:.1f} to {current_avg:.1f} emails/day"
+                })
     
     # Check for unusual top sender
     top_sender = current_results['sender_stats']['top_sender']
-    if top_sender and top_sender['percentage'] > 30:
+    if top_sender and top_sender['percentage'] > SENDER_DOMINANCE_PCT:
         anomalies.append({
             'type': 'sender_dominance',
             'severity': 'medium',
@@ -74,8 +198,7 @@ def detect_anomalies(current_results, baseline):
         })
     
     # Check for high weekend activity
-    weekend_pct = current_results['temporal_patterns']['weekend_percentage']
-    if weekend_pct > 40:
+    if weekend_pct > WEEKEND_PCT or (z is not None and z[1] > Z_THRESHOLD):
         anomalies.append({
             'type': 'weekend_overload',
             'severity': 'medium',
@@ -84,10 +207,7 @@ def detect_anomalies(current_results, baseline):
         })
     
     # Check for late night emails
-    patterns = current_results.get('patterns', {}).get('temporal', {})
-    night_pct = patterns.get('time_of_day', {}).get('night', {}).get('percentage', 0)
-    
-    if night_pct > 25:
+    if night_pct > NIGHT_PCT or (z is not None and z[2] > Z_THRESHOLD):
         anomalies.append({
             'type': 'night_activity',
             'severity': 'low',
@@ -99,28 +219,30 @@ def detect_anomalies(current_results, baseline):
 
 def send_alert(anomalies, results):
     """Send alert about detected anomalies."""
-    print("\n" + "⚠️ " * 20)
-    print("  ANOMALY ALERT")
-    print("⚠️ " * 20)
-    print(f"\nDetected at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    # Assemble the whole alert and write it once rather than line by line
+    lines = [
+        "\n" + _ALERT_BANNER,
+        "  ANOMALY ALERT",
+        _ALERT_BANNER,
+        f"\nDetected at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+    ]
     
     for anomaly in anomalies:
-        severity_emoji = {'
-            'high': '🔴',
-            'medium': '🟡',
-            'low': '🔵'
-        }
-        
-        print(f"{severity_emoji.get(anomaly['severity'], '⚪')} {anomaly['severity'].upper()}: {anomaly['message']}")
-        print(f"   {anomaly['details']}")
-        print()
+        lines += [
+            f"{_SEVERITY_EMOJI.get(anomaly['severity'], '⚪')} {anomaly['severity'].upper()}: {anomaly['message']}",
+            f"   {anomaly['details']}",
+            "",
+        ]
     
-    print("-" * 60)
-    print("\nCurrent Stats:")
-    print(f"  Total emails: {results['total_emails']:,}")
-    print(f"  Emails/day: {results['basic_stats']['avg_per_day']:.1f}")
-    print(f"  Top sender: {results['sender_stats']['top_sender']['email']}")
-    print()
+    lines += [
+        "-" * 60,
+        "\nCurrent Stats:",
+        f"  Total emails: {results['total_emails']:,}",
+        f"  Emails/day: {results['basic_stats']['avg_per_day']:.1f}",
+        f"  Top sender: {results['sender_stats']['top_sender']['email']}",
+        "",
+    ]
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 def monitor_once(config):
     """Run one monitoring cycle."""
@@ -129,18 +251,18 @@ def monitor_once(config):
     # Load previous state
     state = load_state()
     
-    # Connect and fetch recent emails
-    connector = GmailConnector(config=config)
-    if not connector.authenticate():
+    # Connect (reusing the previous cycle's session) and fetch recent emails
+    connector, analyzer = _setup(config)
+    if connector is None:
         print("❌ Authentication failed")
         return
     
     # Fetch emails from last 7 days
     after_date = datetime.now() - timedelta(days=7)
-    emails = connector.fetch_emails(
+    emails = asyncio.run(connector.fetch_emails_async(
         max_results=500,
         after_date=after_date
-    )
+    ))
     
     if not emails:
         print("ℹ️  No emails found")
@@ -148,12 +270,13 @@ def monitor_once(config):
     
     print(f"✅ Fetched {len(emails)} emails")
     
-    # Analyze
-    analyzer = EmailAnalyzer(config)
+    # Analyze (the analyzer outlives the cycle, so drop last cycle's learning data)
+    analyzer.categorizer.categorization_history.clear()
     results = analyzer.analyze(emails)
     
     # Detect anomalies
-    anomalies = detect_anomalies(results, state)
+    metrics = current_metrics(results)
+    anomalies = detect_anomalies(results, state, metrics)
     
     if anomalies:
         send_alert(anomalies, results)
@@ -166,6 +289,7 @@ def monitor_once(config):
     state['last_analysis'] = datetime.now().isoformat()
     state['last_email_count'] = results['total_emails']
     state['baseline_avg_per_day'] = results['basic_stats']['avg_per_day']
+    update_history(state, metrics)
     save_state(state)
 
 def main():
@@ -176,7 +300,7 @@ def main():
     # Load configuration
     try:
         with open('config.yaml', 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=SafeLoader)
     except FileNotFoundError:
         print("❌ Error: config.yaml not found!")
         sys.exit(1)
@@ -195,8 +319,9 @@ def main():
     # Then run on schedule
     try:
         while True:
+            # Sleep until the next job is due instead of polling every minute
+            time.sleep(max(1, schedule.idle_seconds()))
             schedule.run_pending()
-            time.sleep(60)  # Check every minute
     except KeyboardInterrupt:
         print("\n\n🛑 Monitoring stopped by user")
         print("\nMonitoring summary:")
@@ -13,6 +13,14 @@ import yaml
 import logging
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Histogram bars for 0-100% at two percent per block, built once
+_BARS = tuple('█' * n for n in range(51))
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -37,7 +45,7 @@ def main():
     # Load configuration
     try:
         with open('config.yaml', 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=SafeLoader)
     except FileNotFoundError:
         print("❌ Error: config.yaml not found!")
         print("Please copy config.yaml.example to config.yaml and configure it.")
@@ -90,56 +98,65 @@ def main():
     analyzer = EmailAnalyzer(config)
     results = analyzer.analyze(emails)
     
-    # Display results
-    print("\n" + "="*60)
-    print("  ANALYSIS RESULTS")
-    print("="*60 + "\n")
+    # Generate filter suggestions
+    suggester = FilterSuggester(config)
+    suggestions = suggester.generate_suggestions(results, top_k=5)
+    
+    # Display results, assembled first and written to stdout in one go
+    lines = [
+        "",
+        "="*60,
+        "  ANALYSIS RESULTS",
+        "="*60 + "\n",
+    ]
     
     # Summary Statistics
-    print("📊 SUMMARY STATISTICS")
-    print("-" * 40)
-    print(f"Total emails analyzed:  {results['total_emails']:,}")
-    print(f"Date range:            {results['date_range']['start'][:10]} to {results['date_range']['end'][:10]}")
-    print(f"Emails per day:        {results['basic_stats']['avg_per_day']:.1f}")
-    print(f"Unique senders:        {results['basic_stats']['unique_senders']:,}")
-    print(f"Total size:            {results['basic_stats']['total_size_mb']:.1f} MB")
+    lines += [
+        "📊 SUMMARY STATISTICS",
+        "-" * 40,
+        f"Total emails analyzed:  {results['total_emails']:,}",
+        f"Date range:            {results['date_range']['start'][:10]} to {results['date_range']['end'][:10]}",
+        f"Emails per day:        {results['basic_stats']['avg_per_day']:.1f}",
+        f"Unique senders:        {results['basic_stats']['unique_senders']:,}",
+        f"Total size:            {results['basic_stats']['total_size_mb']:.1f} MB",
+    ]
     
     # Top Senders
-    print("\n\n👥 TOP 5 SENDERS")
-    print("-" * 40)
+    lines += ["\n\n👥 TOP 5 SENDERS", "-" * 40]
     for i, sender in enumerate(results['sender_stats']['top_senders'][:5], 1):
-        print(f"{i}. {sender['email'][:50]}")
-        print(f"   {sender['count']:,} emails ({sender['percentage']:.1f}%)")
+        lines.append(f"{i}. {sender['email'][:50]}")
+        lines.append(f"   {sender['count']:,} emails ({sender['percentage']:.1f}%)")
     
     # Temporal Patterns
-    print("\n\n⏰ TEMPORAL PATTERNS")
-    print("-" * 40)
-    print(f"Peak hour:            {results['temporal_patterns']['peak_hour']}:00")
-    print(f"Peak day:             {results['temporal_patterns']['peak_day']}")
-    print(f"Weekend emails:       {results['temporal_patterns']['weekend_percentage']:.1f}%")
+    lines += [
+        "\n\n⏰ TEMPORAL PATTERNS",
+        "-" * 40,
+        f"Peak hour:            {results['temporal_patterns']['peak_hour']}:00",
+        f"Peak day:             {results['temporal_patterns']['peak_day']}",
+        f"Weekend emails:       {results['temporal_patterns']['weekend_percentage']:.1f}%",
+    ]
     
     # Categories
-    print("\n\n🏷️  EMAIL CATEGORIES")
-    print("-" * 40)
+    lines += ["\n\n🏷️  EMAIL CATEGORIES", "-" * 40]
     categories = results['categories']['distribution']
     for category, info in sorted(categories.items(), key=lambda x: x[1]['count'], reverse=True):
-        bar = '█' * int(info['percentage'] / 2)
-        print(f"{category:15} {bar} {info['percentage']:5.1f}% ({info['count']:,})")
-    
-    # Generate filter suggestions
-    print("\n\n🔧 FILTER SUGGESTIONS")
-    print("-" * 40)
-    suggester = FilterSuggester(config)
-    suggestions = suggester.generate_suggestions(results)
+        bar = _BARS[min(50, int(info['percentage'] / 2))]
+        lines.append(f"{category:15} {bar} {info['percentage']:5.1f}% ({info['count']:,})")
     
+    # Filter suggestions
+    lines += ["\n\n🔧 FILTER SUGGESTIONS", "-" * 40]
     if suggestions:
-        for i, suggestion in enumerate(suggestions[:5], 1):
-            print(f"\n{i}. {suggestion['rule']}")
-            print(f"   💬 {suggestion['reason']}")
-            print(f"   🎯 Confidence: {suggestion['confidence']:.0f}%")
-            print(f"   📦 Impact: {suggestion['impact']}")
+        for i, suggestion in enumerate(suggestions, 1):
+            lines += [
+                f"\n{i}. {suggestion['rule']}",
+                f"   💬 {suggestion['reason']}",
+                f"   🎯 Confidence: {suggestion['confidence']:.0f}%",
+                f"   📦 Impact: {suggestion['impact']}",
+            ]
     else:
-        print("No suggestions at this time.")
+        lines.append("No suggestions at this time.")
+    
+    sys.stdout.write('\n'.join(lines) + '\n')
     
     # Generate detailed reports
     print("\n\n📄 Generating detailed reports...")
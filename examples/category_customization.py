@@ -9,8 +9,17 @@ This script demonstrates how to:
 
 import sys
 import yaml
+from collections import Counter
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Histogram bars for 0-100% at two percent per block, built once
+_BARS = tuple('█' * n for n in range(51))
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.categorizer import Categorizer
@@ -24,7 +33,7 @@ def main():
     
     # Load configuration
     with open('config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=SafeLoader)
     
     # Create categorizer
     categorizer = Categorizer(config)
@@ -133,33 +142,28 @@ def main():
             emails = connector.fetch_emails(max_results=200)
             
             if emails:
-                # Count categories
-                category_counts = {}
-                for email in emails:
-                    category = categorizer.categorize(email)
-                    category_counts[category] = category_counts.get(category, 0) + 1
+                # Categorize once and reuse the labels below
+                categorized = [(email, categorizer.categorize(email)) for email in emails]
+                category_counts = Counter(category for _, category in categorized)
                 
                 # Display results
                 print("📊 Category Distribution:\n")
                 total = len(emails)
                 
-                for category, count in sorted(category_counts.items(), key=lambda x: x[1], reverse=True):
+                for category, count in category_counts.most_common():
                     percentage = (count / total) * 100
-                    bar = '█' * int(percentage / 2)
+                    bar = _BARS[min(50, int(percentage / 2))]
                     print(f"  {category:25} {bar} {percentage:5.1f}% ({count:,})")
                 
                 # Find VIP emails
                 if 'VIP' in category_counts:
                     print(f"\n\n🌟 Found {category_counts['VIP']} VIP emails:")
                     print("-" * 60)
-                    vip_count = 0
-                    for email in emails:
-                        if categorizer.categorize(email) == 'VIP':
-                            vip_count += 1
-                            if vip_count <= 5:  # Show first 5
-                                print(f"  • From: {email['sender']}")
-                                print(f"    Subject: {email['subject'][:50]}")
-                                print()
+                    vip_emails = [email for email, category in categorized if category == 'VIP']
+                    for email in vip_emails[:5]:  # Show first 5
+                        print(f"  • From: {email['sender']}")
+                        print(f"    Subject: {email['subject'][:50]}")
+                        print()
             else:
                 print("❌ No emails found.")
         else:
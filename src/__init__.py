@@ -17,20 +17,42 @@ __version__ = "1.0.0"
 __author__ = "CrazyDubya"
 __license__ = "MIT"
 
-from .email_analyzer import EmailAnalyzer
-from .categorizer import Categorizer
-from .pattern_detector import PatternDetector
-from .filter_suggester import FilterSuggester
-from .stats_generator import StatsGenerator
-from .gmail_connector import GmailConnector
-from .outlook_connector import OutlookConnector
-
-__all__ = [
-    "EmailAnalyzer",
-    "Categorizer",
-    "PatternDetector",
-    "FilterSuggester",
-    "StatsGenerator",
-    "GmailConnector",
-    "OutlookConnector",
-]
+import importlib
+from typing import TYPE_CHECKING
+
+# Public names and the submodule that defines each. Submodules are imported on
+# first attribute access (PEP 562) so that, e.g., using only the Categorizer
+# does not pull in the Google API client or matplotlib.
+_LAZY_IMPORTS = {
+    "EmailAnalyzer": "email_analyzer",
+    "Categorizer": "categorizer",
+    "PatternDetector": "pattern_detector",
+    "FilterSuggester": "filter_suggester",
+    "StatsGenerator": "stats_generator",
+    "GmailConnector": "gmail_connector",
+    "OutlookConnector": "outlook_connector",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+if TYPE_CHECKING:
+    from .email_analyzer import EmailAnalyzer
+    from .categorizer import Categorizer
+    from .pattern_detector import PatternDetector
+    from .filter_suggester import FilterSuggester
+    from .stats_generator import StatsGenerator
+    from .gmail_connector import GmailConnector
+    from .outlook_connector import OutlookConnector
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(f".{_LAZY_IMPORTS[name]}", __name__)
+        attr = getattr(module, name)
+        globals()[name] = attr
+        return attr
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -6,12 +6,126 @@ work, automated, social, financial, and spam categories.
 
 import re
 import logging
-from typing import Dict, List, Any, Optional, Set
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Pattern, Set, Tuple
+from collections import defaultdict, deque, OrderedDict
+from functools import partial
 import numpy as np
+import pandas as pd
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Distinct (sender, subject, body) inputs whose scores categorize() remembers
+CATEGORY_CACHE_SIZE = 8192
+
+# Below this many emails, categorize_batch() stays in-process even when given
+# workers: starting processes and pickling the emails would cost more
+PARALLEL_MIN_BATCH = 10000
+
+
+# Compiled tables per CATEGORY_RULES dict, keyed by id() and holding the
+# dict itself so the id stays valid
+_COMPILED_RULES: Dict[int, Tuple[Dict[str, Any], Tuple]] = {}
+
+
+def _case_sensitive_matchers(patterns: List[str]) -> Tuple[Optional[Pattern], Tuple[Pattern, ...]]:
+    """Compile a field's patterns for matching already lowercased ASCII text.
+    
+    The categorizer matches lowercased fields, so for ASCII text IGNORECASE
+    only costs time: it keeps re from using literal prefixes, which makes
+    alternations like "(marketing|promo|newsletter|deals)@" several times
+    slower. Non-ASCII text keeps the IGNORECASE patterns, since case folding
+    also matches e.g. the dotless "ı" against "i". A pattern with uppercase
+    letters in its source (say "\\D") keeps IGNORECASE as well.
+    
+    Returns:
+        Tuple of (prefilter alternation or None, compiled patterns)
+    """
+    flags = {p: 0 if p == p.lower() else re.IGNORECASE for p in patterns}
+    compiled = tuple(re.compile(p, flags[p]) for p in patterns)
+    if not patterns:
+        return None, compiled
+    prefilter_flags = re.IGNORECASE if any(flags.values()) else 0
+    prefilter = re.compile('|'.join(f'(?:{p})' for p in patterns), prefilter_flags)
+    return prefilter, compiled
+
+
+def _compile_rules(category_rules: Dict[str, Dict[str, List[str]]]) -> Tuple:
+    """Compile built-in category rules into read-only matching tables.
+    
+    Returns:
+        Tuple of (compiled_patterns, pattern_prefilters, keyword_table,
+        rule_table, keyword_ceilings). Pattern lists are tuples since the
+        tables are shared.
+    """
+    cached = _COMPILED_RULES.get(id(category_rules))
+    if cached is not None and cached[0] is category_rules:
+        return cached[1]
+    
+    compiled_patterns = {
+        category: {
+            'subject': tuple(re.compile(p, re.IGNORECASE) for p in rules.get('subject_patterns', [])),
+            'sender': tuple(re.compile(p, re.IGNORECASE) for p in rules.get('sender_patterns', []))
+        }
+        for category, rules in category_rules.items()
+    }
+    
+    # One alternation per (category, field) as a prefilter: most fields
+    # match none of a category's patterns, which a single search() rules
+    # out. Every pattern adds to the score, so matches still go through
+    # the individual patterns.
+    pattern_prefilters = {
+        category: {
+            field: re.compile('|'.join(f'(?:{p.pattern})' for p in patterns), re.IGNORECASE)
+            if patterns else None
+            for field, patterns in fields.items()
+        }
+        for category, fields in compiled_patterns.items()
+    }
+    
+    # Each distinct keyword once, with every category that lists it, so
+    # substring matching tests a keyword shared by categories only once
+    keyword_categories = defaultdict(list)
+    for category, rules in category_rules.items():
+        for kw in rules.get('keywords', []):
+            keyword_categories[kw].append(category)
+    keyword_table = tuple(
+        (kw, tuple(categories)) for kw, categories in keyword_categories.items()
+    )
+    
+    # Everything the per-email scoring loop needs for a category, in order:
+    # (category, subject matchers, sender matchers), where each matchers pair
+    # is indexed by field.isascii() and holds a (prefilter, patterns) pair
+    rule_table = tuple(
+        (category,
+         ((pattern_prefilters[category]['subject'], compiled_patterns[category]['subject']),
+          _case_sensitive_matchers(rules.get('subject_patterns', []))),
+         ((pattern_prefilters[category]['sender'], compiled_patterns[category]['sender']),
+          _case_sensitive_matchers(rules.get('sender_patterns', []))))
+        for category, rules in category_rules.items()
+    )
+    
+    # Most a category's keywords can add to its score, aligned with rule_table
+    keyword_ceilings = tuple(
+        len(rules.get('keywords', [])) * 0.3 for rules in category_rules.values()
+    )
+    
+    tables = (compiled_patterns, pattern_prefilters, keyword_table, rule_table, keyword_ceilings)
+    _COMPILED_RULES[id(category_rules)] = (category_rules, tables)
+    return tables
+
+
+def _match_chunk(categorizer: 'Categorizer',
+                 emails: List[Dict[str, Any]]) -> List[Optional[str]]:
+    """Match a chunk of emails to categories in a worker process."""
+    return categorizer._match_batch(emails)
+
 
 class Categorizer:
     """Email categorizer using rule-based and heuristic methods.
@@ -147,24 +261,123 @@ class Categorizer:
         self.custom_categories = self.config.get('categorization', {}).get('custom_categories', [])
         self.confidence_threshold = self.config.get('categorization', {}).get('confidence_threshold', 0.6)
         self.learning_enabled = self.config.get('categorization', {}).get('enable_learning', True)
+        self.history_size = self.config.get('categorization', {}).get('history_size', 1000)
         
         # Compile regex patterns for efficiency
         self._compile_patterns()
+        self._custom_matchers = {}
+        for custom_cat in self.custom_categories:
+            self._compile_custom_category(custom_cat)
+        self._build_keyword_automaton()
+        self._build_decidable_rules()
         
-        # Learning data
-        self.categorization_history = defaultdict(list)
+        # LRU of (best category, score) keyed by the lowercased fields
+        self._category_cache = OrderedDict()
+        # (emails, labels, counts) of the last categorize_batch_with_stats() call
+        self._last_batch = (None, [], {})
+        
+        # Learning data: (sender, subject) of the most recent emails per category
+        self.categorization_history = self._new_history()
         
         logger.info("Categorizer initialized")
     
+    def _new_history(self) -> defaultdict:
+        """Create an empty learning history bounded to history_size emails per category."""
+        return defaultdict(partial(deque, maxlen=self.history_size))
+    
+    @staticmethod
+    def _history_entry(email: Dict[str, Any]) -> Tuple[str, str]:
+        """The part of an email kept in the learning history."""
+        return email.get('sender', ''), email.get('subject', '')
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle without the learning history, e.g. when sent to worker processes."""
+        state = self.__dict__.copy()
+        state['categorization_history'] = self._new_history()
+        state['_category_cache'] = OrderedDict()
+        state['_last_batch'] = (None, [], {})
+        return state
+    
     def _compile_patterns(self):
-        """Compile regex patterns for efficient matching."""
-        self.compiled_patterns = {}
+        """Compile regex patterns for efficient matching.
+        
+        The tables only depend on CATEGORY_RULES, so they are compiled once
+        per rules dict and shared by every categorizer (see _compile_rules).
+        """
+        (self.compiled_patterns, self._pattern_prefilters,
+         self._keyword_table, self._rule_table,
+         self._keyword_ceilings) = _compile_rules(self.CATEGORY_RULES)
+    
+    def _compile_custom_category(self, custom_cat: Dict[str, Any]) -> Tuple[Optional[Tuple[str, ...]], Optional[Pattern]]:
+        """Prepare a custom category's keywords and compile its senders into one regex.
+        
+        The keywords are kept as the distinct, non-empty lowered strings the
+        keyword automaton is built from. Each one is tested on its own, since
+        one alternation regex would miss a keyword inside a longer one.
+        """
+        keywords = tuple(dict.fromkeys(kw.lower() for kw in custom_cat.get('keywords', []) if kw))
+        senders = [s.lower() for s in custom_cat.get('senders', [])]
+        
+        sender_re = re.compile('|'.join(re.escape(s) for s in senders)) if senders else None
+        
+        matcher = (keywords or None, sender_re)
+        self._custom_matchers[custom_cat['name']] = matcher
+        return matcher
+    
+    def _build_keyword_automaton(self):
+        """Build one Aho-Corasick automaton over all category keywords.
+        
+        Each keyword maps to the built-in categories and the custom categories
+        that use it, so a single pass over the text finds the keyword hits of
+        every category. Falls back to substring checks and the custom
+        category regexes when pyahocorasick is not installed.
+        """
+        self._keyword_automaton = None
+        if not AHOCORASICK_AVAILABLE:
+            return
+        
+        automaton = ahocorasick.Automaton()
+        
+        def add(kw, category, custom):
+            kw = kw.lower()
+            if not kw:
+                return
+            _, builtin_cats, custom_cats = automaton.get(kw, (kw, set(), set()))
+            (custom_cats if custom else builtin_cats).add(category)
+            automaton.add_word(kw, (kw, builtin_cats, custom_cats))
         
         for category, rules in self.CATEGORY_RULES.items():
-            self.compiled_patterns[category] = {
-                'subject': [re.compile(p, re.IGNORECASE) for p in rules.get('subject_patterns', [])],
-                'sender': [re.compile(p, re.IGNORECASE) for p in rules.get('sender_patterns', [])]
-            }
+            for kw in rules.get('keywords', []):
+                add(kw, category, False)
+        for custom_cat in self.custom_categories:
+            for kw in custom_cat.get('keywords', []):
+                add(kw, custom_cat['name'], True)
+        
+        automaton.make_automaton()
+        self._keyword_automaton = automaton
+    
+    def _keyword_hits(self, text: str) -> Optional[Tuple[Dict[str, Set[str]], Dict[str, Set[str]]]]:
+        """Return the distinct keywords found in text per built-in and custom category."""
+        if self._keyword_automaton is None:
+            return None
+        
+        builtin_hits = defaultdict(set)
+        custom_hits = defaultdict(set)
+        for _, (kw, builtin_cats, custom_cats) in self._keyword_automaton.iter(text):
+            for category in builtin_cats:
+                builtin_hits[category].add(kw)
+            for name in custom_cats:
+                custom_hits[name].add(kw)
+        return builtin_hits, custom_hits
+    
+    def _keyword_counts(self, text: str) -> Dict[str, int]:
+        """Count the built-in keywords found in text per category, without the automaton."""
+        counts = defaultdict(int)
+        for kw, categories in self._keyword_table:
+            if kw in text:
+                for category in categories:
+                    counts[category] += 1
+        return counts
     
     def categorize(self, email: Dict[str, Any]) -> str:
         """Categorize an email.
@@ -175,103 +388,400 @@ class Categorizer:
         Returns:
             Category name as string
         """
-        scores = self._calculate_category_scores(email)
+        best_category, best_score = self._best_category(*self._lowered_fields(email))
         
-        # Get category with highest score
-        if scores:
-            best_category, best_score = max(scores.items(), key=lambda x: x[1])
-            
-            if best_score >= self.confidence_threshold:
-                if self.learning_enabled:
-                    self.categorization_history[best_category].append(email)
-                return best_category
+        if best_category is not None and best_score >= self.confidence_threshold:
+            # Recorded outside the cache so the history sees every email
+            if self.learning_enabled:
+                self.categorization_history[best_category].append(self._history_entry(email))
+            return best_category
         
         # Default to personal if no strong match
         return 'personal'
     
+    def _best_category(self, sender: str, subject: str,
+                       text: str) -> Tuple[Optional[str], float]:
+        """Return the highest scoring category and its score, memoized.
+        
+        Newsletters and notifications repeat the same sender and subject over
+        and over, so results are kept in an LRU keyed by the lowercased sender,
+        subject and a hash of the text. The threshold is applied by the caller,
+        which keeps cached entries valid if it changes.
+        """
+        cache = self._category_cache
+        key = (sender, subject, hash(text))
+        result = cache.get(key)
+        if result is not None:
+            cache.move_to_end(key)
+            return result
+        
+        pattern_scores = self._pattern_scores(sender, subject)
+        decided = self._decided_by_patterns(pattern_scores)
+        if decided is not None:
+            # Subject and sender settle it, so the body is never scanned
+            result = (decided, 1.0)
+        else:
+            scores = self._category_scores(sender, subject, text, pattern_scores)
+            # Get category with highest score (the first one on ties)
+            if scores:
+                best_category = max(scores, key=scores.get)
+                result = (best_category, scores[best_category])
+            else:
+                result = (None, 0.0)
+        
+        cache[key] = result
+        if len(cache) > CATEGORY_CACHE_SIZE:
+            cache.popitem(last=False)
+        return result
+    
+    @staticmethod
+    def _lowered_fields(email: Dict[str, Any]) -> Tuple[str, str, str]:
+        """Return the lowercased sender, subject and "subject body" text.
+        
+        Uses the 'sender_lc', 'subject_lc' and 'text_lc' fields precomputed by
+        EmailAnalyzer when present, and lowercases the raw fields otherwise.
+        """
+        sender = email.get('sender_lc')
+        if sender is None:
+            sender = email.get('sender', '').lower()
+        subject = email.get('subject_lc')
+        if subject is None:
+            subject = email.get('subject', '').lower()
+        text = email.get('text_lc')
+        if text is None:
+            text = f"{subject} {email.get('body', '').lower()}"
+        return sender, subject, text
+    
     def _calculate_category_scores(self, email: Dict[str, Any]) -> Dict[str, float]:
         """Calculate confidence scores for each category."""
-        scores = {}
-        
-        sender = email.get('sender', '').lower()
-        subject = email.get('subject', '').lower()
-        body = email.get('body', '').lower()
+        sender, subject, text = self._lowered_fields(email)
+        return self._category_scores(sender, subject, text,
+                                     self._pattern_scores(sender, subject))
+    
+    def _pattern_scores(self, sender: str, subject: str) -> List[float]:
+        """Score the subject and sender patterns of each built-in category.
         
-        for category, rules in self.CATEGORY_RULES.items():
+        Returns:
+            Uncapped pattern score per category, in rule order
+        """
+        pattern_scores = []
+        subject_ascii, sender_ascii = subject.isascii(), sender.isascii()
+        for _, subject_matchers, sender_matchers in self._rule_table:
             score = 0.0
             
-            # Check keywords in subject and body
-            keywords = rules.get('keywords', [])
-            text = f"{subject} {body}"
-            keyword_matches = sum(1 for kw in keywords if kw in text)
-            score += keyword_matches * 0.3
-            
             # Check subject patterns
-            for pattern in self.compiled_patterns[category]['subject']:
-                if pattern.search(subject):
-                    score += 0.5
+            prefilter, patterns = subject_matchers[subject_ascii]
+            if prefilter is not None and prefilter.search(subject):
+                for pattern in patterns:
+                    if pattern.search(subject):
+                        score += 0.5
             
             # Check sender patterns
-            for pattern in self.compiled_patterns[category]['sender']:
-                if pattern.search(sender):
-                    score += 0.7
+            prefilter, patterns = sender_matchers[sender_ascii]
+            if prefilter is not None and prefilter.search(sender):
+                for pattern in patterns:
+                    if pattern.search(sender):
+                        score += 0.7
+            
+            pattern_scores.append(score)
+        return pattern_scores
+    
+    def _decided_by_patterns(self, pattern_scores: List[float]) -> Optional[str]:
+        """Return the winning category if subject and sender alone decide it.
+        
+        Scores are capped at 1.0 and ties go to the earlier category, so a
+        category whose patterns alone reach 1.0 wins whatever the body holds,
+        as long as no earlier category could still reach 1.0 with all of its
+        keywords and no custom category replaces one of them. Returns None
+        when the body has to be scanned.
+        """
+        for (category, ceiling), score in zip(self._decidable_rules, pattern_scores):
+            if score >= 1.0:
+                return category
+            if score + ceiling >= 1.0:
+                return None
+        return None
+    
+    def _build_decidable_rules(self):
+        """Collect the leading built-in categories patterns alone may decide.
+        
+        A matching custom category replaces the built-in one of the same
+        name, so from that category on the body always has to be scanned.
+        Stored as (category, keyword ceiling) pairs, rebuilt whenever the
+        custom categories change.
+        """
+        custom_names = {custom_cat['name'] for custom_cat in self.custom_categories}
+        decidable = []
+        for category, ceiling in zip(self.CATEGORY_RULES, self._keyword_ceilings):
+            if category in custom_names:
+                break
+            decidable.append((category, ceiling))
+        self._decidable_rules = tuple(decidable)
+    
+    def _category_scores(self, sender: str, subject: str, text: str,
+                         pattern_scores: List[float]) -> Dict[str, float]:
+        """Add keyword scores to precomputed pattern scores for every category."""
+        scores = {}
+        
+        # One keyword scan of subject and body covers every category
+        hits = self._keyword_hits(text)
+        keyword_counts = self._keyword_counts(text) if hits is None else None
+        
+        for category, pattern_score in zip(self.CATEGORY_RULES, pattern_scores):
+            # Check keywords in subject and body
+            if hits is not None:
+                keyword_matches = len(hits[0].get(category, ()))
+            else:
+                keyword_matches = keyword_counts.get(category, 0)
             
-            scores[category] = min(score, 1.0)  # Cap at 1.0
+            scores[category] = min(keyword_matches * 0.3 + pattern_score, 1.0)  # Cap at 1.0
         
-        # Check custom categories
+        if not self.custom_categories:
+            return scores
+        
+        # Check custom categories against the already lowercased fields
+        fields = {'sender_lc': sender, 'subject_lc': subject, 'text_lc': text}
+        keyword_hits = hits[1] if hits is not None else None
         for custom_cat in self.custom_categories:
-            score = self._check_custom_category(email, custom_cat)
+            score = self._check_custom_category(fields, custom_cat, keyword_hits)
             if score > 0:
                 scores[custom_cat['name']] = score
         
         return scores
     
     def _check_custom_category(self, email: Dict[str, Any], 
-                              custom_cat: Dict[str, Any]) -> float:
-        """Check if email matches a custom category."""
+                              custom_cat: Dict[str, Any],
+                              keyword_hits: Optional[Dict[str, Set[str]]] = None) -> float:
+        """Check if email matches a custom category.
+        
+        ``keyword_hits`` are precomputed automaton matches for the email's
+        custom categories, as returned by _keyword_hits; the keyword regex is
+        used otherwise.
+        """
         score = 0.0
         
-        sender = email.get('sender', '').lower()
-        subject = email.get('subject', '').lower()
-        body = email.get('body', '').lower()
-        text = f"{subject} {body}"
+        sender, _, text = self._lowered_fields(email)
+        
+        keywords, sender_re = (self._custom_matchers.get(custom_cat['name'])
+                               or self._compile_custom_category(custom_cat))
         
         # Check keywords
-        keywords = custom_cat.get('keywords', [])
-        keyword_matches = sum(1 for kw in keywords if kw.lower() in text)
-        score += keyword_matches * 0.4
+        if keyword_hits is not None:
+            score += len(keyword_hits.get(custom_cat['name'], ())) * 0.4
+        elif keywords is not None:
+            keyword_matches = sum(kw in text for kw in keywords)
+            score += keyword_matches * 0.4
         
         # Check senders
-        senders = custom_cat.get('senders', [])
-        if any(s.lower() in sender for s in senders):
+        if sender_re is not None and sender_re.search(sender):
             score += 0.8
         
         return min(score, 1.0)
     
-    def categorize_batch(self, emails: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def categorize_batch(self, emails: List[Dict[str, Any]],
+                         workers: int = 1) -> List[Dict[str, Any]]:
         """Categorize multiple emails efficiently.
         
+        Gives the same categories as calling categorize() on each email, but
+        scores the whole batch column by column (see _score_matrix).
+        
         Args:
             emails: List of email dictionaries
+            workers: Worker processes to split large batches across
         
         Returns:
             List of dictionaries with 'email' and 'category' keys
         """
+        labels, _ = self.categorize_batch_with_stats(emails, workers)
+        return [
+            {'email': email, 'category': category}
+            for email, category in zip(emails, labels)
+        ]
+    
+    def categorize_batch_with_stats(self, emails: List[Dict[str, Any]], workers: int = 1
+                                    ) -> Tuple[List[str], Dict[str, int]]:
+        """Categorize a batch and count the categories in the same pass.
+        
+        The labels are remembered, so a following get_category_stats() call
+        for the same list does not categorize it again.
+        
+        Args:
+            emails: List of email dictionaries
+            workers: Worker processes to split the batch across; batches
+                smaller than PARALLEL_MIN_BATCH are always categorized here
+        
+        Returns:
+            Tuple of the category of each email and the number of emails per
+            category, in order of first appearance
+        """
+        if workers > 1 and len(emails) >= PARALLEL_MIN_BATCH:
+            # Workers only need the lowercased fields, not the raw emails
+            fields = [
+                {'sender_lc': sender, 'subject_lc': subject, 'text_lc': text}
+                for sender, subject, text in map(self._lowered_fields, emails)
+            ]
+            chunk_size = -(-len(fields) // workers)
+            chunks = [fields[i:i + chunk_size] for i in range(0, len(fields), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                matched = [category
+                           for chunk_matched in executor.map(_match_chunk, [self] * len(chunks), chunks)
+                           for category in chunk_matched]
+        else:
+            matched = self._match_batch(emails)
+        
+        labels = []
+        counts = defaultdict(int)
+        for email, category in zip(emails, matched):
+            if category is None:
+                category = 'personal'
+            elif self.learning_enabled:
+                self.categorization_history[category].append(self._history_entry(email))
+            labels.append(category)
+            counts[category] += 1
+        
+        self._last_batch = (emails, labels, counts)
+        return labels, counts
+    
+    def _match_batch(self, emails: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Return each email's best category, or None if below the threshold."""
+        if not emails:
+            return []
+        
+        names, scores = self._score_matrix(emails)
+        # argmax takes the first maximum, like max() over the scores dict
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(emails)), best]
         return [
-            {
-                'email': email,
-                'category': self.categorize(email)
-            }
-            for email in emails
+            names[index] if score >= self.confidence_threshold else None
+            for index, score in zip(best.tolist(), best_scores.tolist())
+        ]
+    
+    def _score_matrix(self, emails: List[Dict[str, Any]]) -> Tuple[List[str], np.ndarray]:
+        """Score a batch of emails against every category at once.
+        
+        Produces the same scores as _calculate_category_scores, but works a
+        column at a time: each field is factorized so that every pattern runs
+        once per distinct sender, subject or text rather than once per email,
+        and the scores are accumulated as numpy columns. A custom category
+        that scores 0 gets a zero column rather than being left out, and
+        emails decided by their subject and sender alone get no keyword
+        scores (see _decided_by_patterns); neither changes which category
+        wins or whether it meets the threshold.
+        
+        Returns:
+            Category names and an (emails x categories) score matrix
+        """
+        n = len(emails)
+        senders, subjects, texts = (
+            pd.factorize(np.array(values, dtype=object))
+            for values in zip(*(self._lowered_fields(email) for email in emails))
+        )
+        
+        def matches(pattern: Pattern, field: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+            codes, uniques = field
+            found = np.fromiter((pattern.search(v) is not None for v in uniques),
+                                dtype=bool, count=len(uniques))
+            return found[codes]
+        
+        def pattern_score(matchers: Tuple, field: Tuple[np.ndarray, np.ndarray],
+                          weight: float, score: np.ndarray) -> np.ndarray:
+            if matchers[0][0] is None:
+                return score
+            codes, uniques = field
+            # Each distinct value uses the matchers for its own isascii()
+            value_matchers = [matchers[v.isascii()] for v in uniques]
+            candidates = np.flatnonzero(np.fromiter(
+                (m[0].search(v) is not None for m, v in zip(value_matchers, uniques)),
+                dtype=bool, count=len(uniques)
+            )).tolist()
+            for j in range(len(matchers[0][1])):
+                found = np.zeros(len(uniques), dtype=bool)
+                found[candidates] = [value_matchers[i][1][j].search(uniques[i]) is not None
+                                     for i in candidates]
+                score += found[codes] * weight
+            return score
+        
+        # Subject and sender patterns first (0.5 and 0.7 per match)
+        pattern_columns = [
+            pattern_score(sender_matchers, senders, 0.7,
+                          pattern_score(subject_matchers, subjects, 0.5, np.zeros(n)))
+            for _, subject_matchers, sender_matchers in self._rule_table
         ]
+        
+        # Emails the patterns alone decide, as in _decided_by_patterns
+        decided = np.zeros(n, dtype=bool)
+        open_rows = np.ones(n, dtype=bool)
+        for pattern, (_, ceiling) in zip(pattern_columns, self._decidable_rules):
+            wins = open_rows & (pattern >= 1.0)
+            decided |= wins
+            open_rows &= ~wins & (pattern + ceiling < 1.0)
+        
+        # Only texts of undecided emails are scanned for keywords
+        text_codes, unique_texts = texts
+        needed = np.zeros(len(unique_texts), dtype=bool)
+        needed[text_codes[~decided]] = True
+        needed = needed.tolist()
+        
+        hits = ([self._keyword_hits(text) if need else ({}, {})
+                 for text, need in zip(unique_texts, needed)]
+                if self._keyword_automaton is not None else None)
+        
+        keyword_counts = ([self._keyword_counts(text) if need else {}
+                           for text, need in zip(unique_texts, needed)]
+                          if hits is None else None)
+        
+        def hit_counts(which: int, name: str) -> np.ndarray:
+            counts = np.fromiter((len(h[which].get(name, ())) for h in hits),
+                                 dtype=float, count=len(hits))
+            return counts[text_codes]
+        
+        columns = {}
+        for category, pattern in zip(self.CATEGORY_RULES, pattern_columns):
+            # Check keywords in subject and body
+            if hits is not None:
+                keyword_matches = hit_counts(0, category)
+            else:
+                keyword_matches = np.fromiter((c.get(category, 0) for c in keyword_counts),
+                                              dtype=float, count=len(keyword_counts))[text_codes]
+            
+            columns[category] = np.minimum(keyword_matches * 0.3 + pattern, 1.0)  # Cap at 1.0
+        
+        for custom_cat in self.custom_categories:
+            name = custom_cat['name']
+            keywords, sender_re = (self._custom_matchers.get(name)
+                                   or self._compile_custom_category(custom_cat))
+            
+            if hits is not None:
+                keyword_matches = hit_counts(1, name)
+            elif keywords is not None:
+                keyword_matches = np.fromiter(
+                    (sum(kw in t for kw in keywords) if need else 0
+                     for t, need in zip(unique_texts, needed)),
+                    dtype=float, count=len(unique_texts)
+                )[text_codes]
+            else:
+                keyword_matches = np.zeros(n)
+            score = keyword_matches * 0.4
+            if sender_re is not None:
+                score += matches(sender_re, senders) * 0.8
+            score = np.minimum(score, 1.0)
+            
+            # Like the per-email path, a matching custom category replaces a
+            # built-in one of the same name
+            if name in columns:
+                score = np.where(score > 0, score, columns[name])
+            columns[name] = score
+        
+        return list(columns), np.column_stack(list(columns.values()))
     
     def get_category_stats(self, emails: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Get categorization statistics for a list of emails."""
-        categorized = self.categorize_batch(emails)
-        category_counts = defaultdict(int)
+        """Get categorization statistics for a list of emails.
         
-        for item in categorized:
-            category_counts[item['category']] += 1
+        Reuses the labels of the last batch when called with the same list.
+        """
+        last_emails, labels, category_counts = self._last_batch
+        if last_emails is not emails or len(labels) != len(emails):
+            _, category_counts = self.categorize_batch_with_stats(emails)
         
         total = len(emails)
         return {
@@ -305,4 +815,9 @@ class Categorizer:
         }
         
         self.custom_categories.append(custom_cat)
+        self._compile_custom_category(custom_cat)
+        self._build_keyword_automaton()
+        self._build_decidable_rules()
+        self._category_cache.clear()
+        self._last_batch = (None, [], {})
         logger.info(f"Added custom category: {name}")
@@ -5,18 +5,90 @@ including frequency analysis, timing patterns, and sender behaviors.
 """
 
 import logging
-from collections import Counter, defaultdict
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Any, Iterable, Optional, Tuple
 import pandas as pd
 import numpy as np
 from dateutil import parser as date_parser
 
-from .pattern_detector import PatternDetector
+from .pattern_detector import PatternDetector, _date_columns
 from .categorizer import Categorizer
 
 logger = logging.getLogger(__name__)
 
+# Below this many emails, starting worker processes and pickling the emails
+# costs more than parallel categorization saves
+PARALLEL_MIN_EMAILS = 5000
+
+# strptime formats tried before dateutil, the last one that matched first
+_DATE_FORMATS = [
+    '%a, %d %b %Y %H:%M:%S %z',  # RFC 2822, as in message headers
+    '%d %b %Y %H:%M:%S %z',
+    '%Y-%m-%dT%H:%M:%S%z',
+    '%Y-%m-%dT%H:%M:%S.%f%z',
+    '%Y-%m-%d %H:%M:%S',
+]
+# Dates in a row that fell through to dateutil. While this is nonzero only
+# the first format is tried (with a full rescan every 64 dates), so an export
+# in some other format does not pay for every failed strptime
+_date_format_misses = 0
+
+
+def _parse_date(value: str) -> datetime:
+    """Parse a date string, trying fast exact parsers before dateutil.
+    
+    A mailbox export uses one or two date formats throughout, so ISO 8601 and
+    the recently matched strptime format handle nearly every email and
+    dateutil's format guessing only runs for the odd one out.
+    """
+    global _date_format_misses
+    
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    
+    # Header dates often end in a zone comment such as "(UTC)" or "(PST)"
+    stripped = value.rsplit(' (', 1)[0] if value.endswith(')') else value
+    formats = _DATE_FORMATS if _date_format_misses % 64 == 0 else _DATE_FORMATS[:1]
+    for i, fmt in enumerate(formats):
+        try:
+            date = datetime.strptime(stripped, fmt)
+        except ValueError:
+            continue
+        if i:
+            _DATE_FORMATS.insert(0, _DATE_FORMATS.pop(i))
+        _date_format_misses = 0
+        return date
+    
+    _date_format_misses += 1
+    return date_parser.parse(value)
+
+
+def _count_categories(categorizer: Categorizer,
+                      emails: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Count emails per category, in order of first appearance.
+    
+    Module-level so it can run in a worker process.
+    """
+    return categorizer.categorize_batch_with_stats(emails)[1]
+
+
+def _category_summary(counts: Dict[str, int], total: int) -> Dict[str, Any]:
+    """Build the category distribution from per-category counts."""
+    return {
+        "distribution": {
+            cat: {
+                "count": count,
+                "percentage": (count / total) * 100
+            }
+            for cat, count in counts.items()
+        },
+        "dominant_category": max(counts, key=counts.get) if counts else None
+    }
+
 
 class EmailAnalyzer:
     """Main email analysis engine.
@@ -40,15 +112,18 @@ class EmailAnalyzer:
         self.pattern_detector = PatternDetector(config)
         self.categorizer = Categorizer(config)
         self.analysis_cache = {}
+        self.enable_parallel = self.config.get('performance', {}).get('enable_parallel', False)
+        self.num_workers = self.config.get('performance', {}).get('num_workers', 4)
         
         logger.info("EmailAnalyzer initialized")
     
-    def analyze(self, emails: List[Dict[str, Any]], 
+    def analyze(self, emails: Iterable[Dict[str, Any]], 
                 use_cache: bool = True) -> Dict[str, Any]:
         """Perform comprehensive email analysis.
         
         Args:
-            emails: List of email dictionaries with fields:
+            emails: List or other iterable (e.g. a generator from
+                ``GmailConnector.iter_emails``) of email dictionaries with fields:
                 - sender: Email address of sender
                 - subject: Email subject
                 - date: Email date (string or datetime)
@@ -66,29 +141,57 @@ class EmailAnalyzer:
                 - patterns: Detected patterns
                 - recommendations: Action recommendations
         """
-        logger.info(f"Starting analysis of {len(emails)} emails")
+        # Parse and normalize email data; this is the only pass over the input,
+        # so streamed emails are never materialized in their raw form
+        normalized_emails = self._normalize_emails(emails)
+        logger.info(f"Starting analysis of {len(normalized_emails)} emails")
         
-        if not emails:
+        if not normalized_emails:
             logger.warning("No emails to analyze")
             return self._empty_analysis()
         
-        # Parse and normalize email data
-        normalized_emails = self._normalize_emails(emails)
-        
-        # Basic statistics
-        basic_stats = self._calculate_basic_stats(normalized_emails)
-        
-        # Sender analysis
-        sender_stats = self._analyze_senders(normalized_emails)
-        
-        # Temporal analysis
-        temporal_patterns = self._analyze_temporal_patterns(normalized_emails)
+        # Categorization is by far the most expensive pass, so for large inputs
+        # it is split across worker processes while the other passes run here
+        executor = None
+        if (self.enable_parallel and self.num_workers > 1
+                and len(normalized_emails) >= PARALLEL_MIN_EMAILS):
+            executor = ProcessPoolExecutor(max_workers=self.num_workers)
+            chunk_size = -(-len(normalized_emails) // self.num_workers)
+            category_futures = [
+                executor.submit(_count_categories, self.categorizer,
+                                normalized_emails[i:i + chunk_size])
+                for i in range(0, len(normalized_emails), chunk_size)
+            ]
         
-        # Categorize emails
-        categories = self._categorize_emails(normalized_emails)
-        
-        # Detect advanced patterns
-        patterns = self.pattern_detector.detect_patterns(normalized_emails)
+        try:
+            # The fields the statistics aggregate, extracted once as columns
+            frame = self._email_frame(normalized_emails)
+            
+            # Basic statistics
+            basic_stats = self._calculate_basic_stats(normalized_emails, frame)
+            
+            # Sender analysis
+            sender_stats = self._analyze_senders(normalized_emails, frame)
+            
+            # Temporal analysis
+            temporal_patterns = self._analyze_temporal_patterns(normalized_emails, frame)
+            
+            # Detect advanced patterns
+            patterns = self.pattern_detector.detect_patterns(normalized_emails, frame)
+            
+            # Categorize emails
+            if executor is not None:
+                # Merge in chunk order so categories keep first-appearance order
+                counts = defaultdict(int)
+                for future in category_futures:
+                    for cat, count in future.result().items():
+                        counts[cat] += count
+                categories = _category_summary(counts, len(normalized_emails))
+            else:
+                categories = self._categorize_emails(normalized_emails)
+        finally:
+            if executor is not None:
+                executor.shutdown()
         
         # Generate recommendations
         recommendations = self._generate_recommendations(
@@ -110,7 +213,7 @@ class EmailAnalyzer:
         logger.info("Analysis completed successfully")
         return results
     
-    def _normalize_emails(self, emails: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _normalize_emails(self, emails: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Normalize email data to consistent format."""
         normalized = []
         
@@ -118,20 +221,29 @@ class EmailAnalyzer:
             try:
                 # Parse date
                 if isinstance(email.get('date'), str):
-                    date = date_parser.parse(email['date'])
+                    date = _parse_date(email['date'])
                 elif isinstance(email.get('date'), datetime):
                     date = email['date']
                 else:
                     date = datetime.now()
                 
+                sender = email.get('sender', 'unknown@unknown.com').lower()
+                subject = email.get('subject', '')
+                body = email.get('body', '')
+                subject_lc = subject.lower()
+                
                 normalized.append({
-                    'sender': email.get('sender', 'unknown@unknown.com').lower(),
-                    'subject': email.get('subject', ''),
+                    'sender': sender,
+                    'subject': subject,
                     'date': date,
-                    'body': email.get('body', ''),
+                    'body': body,
                     'labels': email.get('labels', []),
                     'thread_id': email.get('thread_id', None),
-                    'size': email.get('size', 0)
+                    'size': email.get('size', 0),
+                    # Lowercased once here for the categorizer's matching
+                    'sender_lc': sender,
+                    'subject_lc': subject_lc,
+                    'text_lc': f"{subject_lc} {body.lower()}"
                 })
             except Exception as e:
                 logger.warning(f"Error normalizing email: {e}")
@@ -139,109 +251,141 @@ class EmailAnalyzer:
         
         return normalized
     
-    def _calculate_basic_stats(self, emails: List[Dict[str, Any]]) -> Dict[str, Any]:
+    @staticmethod
+    def _email_frame(emails: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Collect the fields aggregated by the statistics passes as columns.
+        
+        Built once per analysis, so each pass works on whole columns rather
+        than pulling its fields out of the email dicts again.
+        
+        Returns:
+            DataFrame with one row per email and the columns 'sender'
+            (categorical, categories in order of first appearance), 'instant'
+            (comparable datetime64[us]; aware dates converted to UTC), 'local'
+            (datetime64[us] wall-clock time in each email's own timezone),
+            'size' and 'thread_id'
+        """
+        codes, senders = pd.factorize(np.array([e['sender'] for e in emails], dtype=object))
+        instants, local = _date_columns([e['date'] for e in emails])
+        
+        return pd.DataFrame({
+            'sender': pd.Categorical.from_codes(codes, senders),
+            'instant': instants,
+            'local': local,
+            'size': np.fromiter((e['size'] for e in emails), dtype=np.float64, count=len(emails)),
+            # object dtype keeps missing ids as None rather than NaN
+            'thread_id': pd.Series([e['thread_id'] for e in emails], dtype=object)
+        })
+    
+    def _calculate_basic_stats(self, emails: List[Dict[str, Any]],
+                               frame: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Calculate basic email statistics."""
-        dates = [e['date'] for e in emails]
+        if frame is None:
+            frame = self._email_frame(emails)
+        instants = frame['instant'].to_numpy()
         
+        # argmin/argmax pick the first earliest/latest email like min()/max(),
+        # and the range keeps that email's own date and timezone
+        first, last = int(instants.argmin()), int(instants.argmax())
+        days = int((instants[last] - instants[first]) // np.timedelta64(1, 'D'))
         return {
             "date_range": {
-                "start": min(dates).isoformat(),
-                "end": max(dates).isoformat()
+                "start": emails[first]['date'].isoformat(),
+                "end": emails[last]['date'].isoformat()
             },
-            "total_size_mb": sum(e['size'] for e in emails) / (1024 * 1024),
-            "avg_per_day": len(emails) / max((max(dates) - min(dates)).days, 1),
-            "unique_senders": len(set(e['sender'] for e in emails)),
-            "unique_threads": len(set(e['thread_id'] for e in emails if e['thread_id']))
+            "total_size_mb": float(frame['size'].to_numpy().sum()) / (1024 * 1024),
+            "avg_per_day": len(emails) / max(days, 1),
+            "unique_senders": len(frame['sender'].cat.categories),
+            "unique_threads": len(set(t for t in frame['thread_id'].tolist() if t))
         }
     
-    def _analyze_senders(self, emails: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_senders(self, emails: List[Dict[str, Any]],
+                         frame: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Analyze sender patterns and statistics."""
-        sender_counts = Counter(e['sender'] for e in emails)
-        sender_dates = defaultdict(list)
-        
-        for email in emails:
-            sender_dates[email['sender']].append(email['date'])
+        if frame is None:
+            frame = self._email_frame(emails)
+        codes = frame['sender'].cat.codes.to_numpy()
+        senders = frame['sender'].cat.categories.tolist()
+        instants = frame['instant'].to_numpy()
+        sender_counts = np.bincount(codes, minlength=len(senders))
         
-        # Top senders
-        top_senders = [
-            {
-                "email": sender,
+        # Top senders; the stable sort breaks ties by first appearance like
+        # Counter.most_common
+        top_senders = []
+        for code in np.argsort(-sender_counts, kind='stable')[:20].tolist():
+            count = int(sender_counts[code])
+            top_senders.append({
+                "email": senders[code],
                 "count": count,
                 "percentage": (count / len(emails)) * 100
-            }
-            for sender, count in sender_counts.most_common(20)
-        ]
+            })
         
-        # Calculate sender frequency
-        sender_frequency = {}
-        for sender, dates in sender_dates.items():
-            if len(dates) > 1:
-                sorted_dates = sorted(dates)
-                intervals = [(sorted_dates[i+1] - sorted_dates[i]).days 
-                           for i in range(len(sorted_dates)-1)]
-                avg_interval = np.mean(intervals) if intervals else 0
-                sender_frequency[sender] = {
-                    "avg_days_between": avg_interval,
-                    "regularity_score": 1 / (1 + np.std(intervals)) if intervals else 0
-                }
+        # Calculate sender frequency from the gaps between each sender's
+        # emails: sort by (sender, date) once and diff neighbouring rows
+        order = np.lexsort((instants, codes))
+        codes, instants = codes[order], instants[order]
+        same_sender = codes[1:] == codes[:-1]
+        
+        # Whole days between consecutive emails, as timedelta.days gives
+        gaps = pd.DataFrame({
+            'sender': codes[1:][same_sender],
+            'days': (np.diff(instants) // np.timedelta64(1, 'D'))[same_sender]
+        }).groupby('sender')['days']
+        means, stds = gaps.mean(), gaps.std(ddof=0)
+        
+        # Codes follow first appearance, so senders keep their original order
+        sender_frequency = {
+            senders[code]: {
+                "avg_days_between": avg_interval,
+                "regularity_score": 1 / (1 + std)
+            }
+            for code, avg_interval, std in zip(means.index, means, stds)
+        }
         
         return {
             "top_senders": top_senders,
-            "total_senders": len(sender_counts),
+            "total_senders": len(senders),
             "top_sender": top_senders[0] if top_senders else None,
             "sender_frequency": sender_frequency
         }
     
-    def _analyze_temporal_patterns(self, emails: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Analyze time-based patterns in email activity."""
+    def _analyze_temporal_patterns(self, emails: List[Dict[str, Any]],
+                                   frame: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """Analyze time-based patterns in email activity.
+        
+        Hours and days are taken from each email's own wall-clock time, as
+        datetime.hour and weekday() on the original dates would give.
+        """
+        if frame is None:
+            frame = self._email_frame(emails)
+        dates = frame['local'].to_numpy()
+        
         # Hour of day distribution
-        hours = [e['date'].hour for e in emails]
-        hour_dist = Counter(hours)
+        hour_counts = np.bincount(dates.astype('datetime64[h]').astype(np.int64) % 24, minlength=24)
+        hour_dist = {h: int(c) for h, c in enumerate(hour_counts) if c}
         
-        # Day of week distribution
-        days = [e['date'].weekday() for e in emails]  # 0 = Monday
-        day_dist = Counter(days)
+        # Day of week distribution (0 = Monday; the epoch was a Thursday)
+        days = (dates.astype('datetime64[D]').astype(np.int64) + 3) % 7
+        day_counts = np.bincount(days, minlength=7)
+        day_dist = {d: int(c) for d, c in enumerate(day_counts) if c}
         day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
         
-        # Monthly trends
-        monthly = defaultdict(int)
-        for email in emails:
-            month_key = email['date'].strftime('%Y-%m')
-            monthly[month_key] += 1
+        # Monthly trends (np.unique returns the months sorted)
+        months, month_counts = np.unique(dates.astype('datetime64[M]'), return_counts=True)
+        monthly = {str(m): int(c) for m, c in zip(months, month_counts)}
         
         return {
-            "peak_hour": max(hour_dist.items(), key=lambda x: x[1])[0] if hour_dist else None,
-            "hourly_distribution": dict(hour_dist),
-            "peak_day": day_names[max(day_dist.items(), key=lambda x: x[1])[0]] if day_dist else None,
+            "peak_hour": int(hour_counts.argmax()) if hour_dist else None,
+            "hourly_distribution": hour_dist,
+            "peak_day": day_names[int(day_counts.argmax())] if day_dist else None,
             "daily_distribution": {day_names[k]: v for k, v in day_dist.items()},
-            "monthly_trends": dict(sorted(monthly.items())),
-            "weekend_percentage": sum(1 for d in days if d >= 5) / len(days) * 100 if days else 0
+            "monthly_trends": monthly,
+            "weekend_percentage": float((days >= 5).mean() * 100) if days.size else 0
         }
     
     def _categorize_emails(self, emails: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Categorize all emails and generate distribution."""
-        categories = defaultdict(int)
-        categorized_emails = []
-        
-        for email in emails:
-            category = self.categorizer.categorize(email)
-            categories[category] += 1
-            categorized_emails.append({
-                'email': email,
-                'category': category
-            })
-        
-        total = len(emails)
-        return {
-            "distribution": {
-                cat: {
-                    "count": count,
-                    "percentage": (count / total) * 100
-                }
-                for cat, count in categories.items()
-            },
-            "dominant_category": max(categories.items(), key=lambda x: x[1])[0] if categories else None
-        }
+        return _category_summary(_count_categories(self.categorizer, emails), len(emails))
     
     def _generate_recommendations(self, emails: List[Dict[str, Any]], 
                                  sender_stats: Dict[str, Any],
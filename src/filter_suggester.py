@@ -4,6 +4,7 @@ Generates intelligent filter rule suggestions based on email patterns
 and user behavior analysis.
 """
 
+import heapq
 import logging
 from typing import Dict, List, Any, Optional
 from collections import defaultdict
@@ -11,6 +12,11 @@ from collections import defaultdict
 logger = logging.getLogger(__name__)
 
 
+def _suggestion_rank(suggestion: Dict[str, Any]) -> tuple:
+    """Sort key: lower priority number first, then higher confidence."""
+    return (suggestion.get('priority', 1), -suggestion.get('confidence', 0))
+
+
 class FilterSuggester:
     """Generates filter rule suggestions.
     
@@ -40,56 +46,67 @@ class FilterSuggester:
         
         logger.info("FilterSuggester initialized")
     
-    def generate_suggestions(self, analysis_results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def generate_suggestions(self, analysis_results: Dict[str, Any],
+                             top_k: Optional[int] = None) -> List[Dict[str, Any]]:
         """Generate filter suggestions based on analysis results.
         
         Args:
             analysis_results: Output from EmailAnalyzer
+            top_k: Only return the first top_k suggestions in ranking order
         
         Returns:
             List of suggestion dictionaries with rule, reason, confidence, etc.
         """
         suggestions = []
         
+        # Sections shared by several rule types, looked up once
+        categories = analysis_results.get('categories', {}).get('distribution', {})
+        patterns = analysis_results.get('patterns', {})
+        
         # Auto-archive suggestions
         if 'auto_archive' in self.suggestion_types:
-            suggestions.extend(self._suggest_auto_archive(analysis_results))
+            suggestions.extend(self._suggest_auto_archive(analysis_results, categories))
         
         # Auto-label suggestions
         if 'auto_label' in self.suggestion_types:
-            suggestions.extend(self._suggest_auto_label(analysis_results))
+            suggestions.extend(self._suggest_auto_label(categories, patterns))
         
         # Priority inbox suggestions
         if 'priority_inbox' in self.suggestion_types:
-            suggestions.extend(self._suggest_priority_inbox(analysis_results))
+            suggestions.extend(self._suggest_priority_inbox(categories))
         
         # Spam detection suggestions
         if 'spam_detection' in self.suggestion_types:
-            suggestions.extend(self._suggest_spam_filters(analysis_results))
-        
-        # Sort by confidence and priority
-        suggestions.sort(key=lambda x: (x.get('priority', 1), -x.get('confidence', 0)))
+            suggestions.extend(self._suggest_spam_filters(analysis_results, patterns))
         
         logger.info(f"Generated {len(suggestions)} filter suggestions")
+        
+        # Sort by confidence and priority
+        if top_k is not None and top_k < len(suggestions):
+            # Partial selection; like sort(), keeps ties in generation order
+            return heapq.nsmallest(top_k, suggestions, key=_suggestion_rank)
+        suggestions.sort(key=_suggestion_rank)
         return suggestions
     
-    def _suggest_auto_archive(self, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _suggest_auto_archive(self, results: Dict[str, Any],
+                              categories: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Suggest auto-archive rules for high-volume senders."""
         suggestions = []
         
         sender_stats = results.get('sender_stats', {})
         top_senders = sender_stats.get('top_senders', [])
-        categories = results.get('categories', {}).get('distribution', {})
+        min_emails = self.min_emails
+        confidence_threshold = self.confidence_threshold
         
         for sender_info in top_senders:
-            if sender_info['count'] < self.min_emails:
+            if sender_info['count'] < min_emails:
                 continue
             
             # High-volume promotional senders
             if sender_info['percentage'] > 5:  # More than 5% of emails
                 confidence = min(sender_info['percentage'] / 10, 1.0)
                 
-                if confidence >= self.confidence_threshold or self.aggressive_mode:
+                if confidence >= confidence_threshold or self.aggressive_mode:
                     suggestions.append({
                         'type': 'auto_archive',
                         'rule': f"Archive emails from {sender_info['email']}",
@@ -123,16 +140,15 @@ class FilterSuggester:
         
         return suggestions
     
-    def _suggest_auto_label(self, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _suggest_auto_label(self, categories: Dict[str, Dict[str, Any]],
+                            patterns: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Suggest auto-labeling rules based on categories."""
         suggestions = []
-        
-        categories = results.get('categories', {}).get('distribution', {})
-        patterns = results.get('patterns', {})
+        min_emails = self.min_emails
         
         # Suggest labels for major categories
         for category, info in categories.items():
-            if info['count'] >= self.min_emails and info['percentage'] > 10:
+            if info['count'] >= min_emails and info['percentage'] > 10:
                 suggestions.append({
                     'type': 'auto_label',
                     'rule': f"Auto-label {category} emails",
@@ -151,7 +167,7 @@ class FilterSuggester:
         # Suggest labels for frequent senders
         sender_patterns = patterns.get('sender', {}).get('frequent_senders', [])
         for sender_info in sender_patterns[:5]:  # Top 5
-            if sender_info['count'] >= self.min_emails * 2:
+            if sender_info['count'] >= min_emails * 2:
                 # Extract domain for label suggestion
                 domain = sender_info['sender'].split('@')[-1].split('.')[0]
                 
@@ -172,12 +188,10 @@ class FilterSuggester:
         
         return suggestions
     
-    def _suggest_priority_inbox(self, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _suggest_priority_inbox(self, categories: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Suggest priority inbox rules for important emails."""
         suggestions = []
         
-        categories = results.get('categories', {}).get('distribution', {})
-        
         # Prioritize work emails
         work_info = categories.get('work', {})
         if work_info and work_info.get('count', 0) >= self.min_emails:
@@ -214,11 +228,11 @@ class FilterSuggester:
         
         return suggestions
     
-    def _suggest_spam_filters(self, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _suggest_spam_filters(self, results: Dict[str, Any],
+                              patterns: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Suggest spam detection rules."""
         suggestions = []
         
-        patterns = results.get('patterns', {})
         content_patterns = patterns.get('content', {})
         
         # Check for high newsletter percentage
@@ -4,13 +4,25 @@ Provides connection and data fetching capabilities for Gmail using
 the Google Gmail API with OAuth 2.0 authentication.
 """
 
+import asyncio
 import logging
 import os
 import pickle
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Iterator, Optional
+from datetime import datetime, timedelta, timezone
 import base64
 from email.mime.text import MIMEText
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from pathlib import Path
+
+import msgpack
 
 try:
     from google.auth.transport.requests import Request
@@ -18,6 +30,8 @@ try:
     from google_auth_oauthlib.flow import InstalledAppFlow
     from googleapiclient.discovery import build
     from googleapiclient.errors import HttpError
+    import google_auth_httplib2
+    import httplib2
     GMAIL_AVAILABLE = True
 except ImportError:
     GMAIL_AVAILABLE = False
@@ -25,6 +39,145 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Most requests Gmail accepts in one batch HTTP request
+BATCH_REQUEST_LIMIT = 100
+
+# Times a throttled or failed batch sub-request is resent
+BATCH_RETRIES = 3
+
+# 403 error reasons Gmail uses for rate limiting
+_RATE_LIMIT_REASONS = frozenset(['rateLimitExceeded', 'userRateLimitExceeded'])
+
+# Most message IDs messages.list returns per page
+LIST_PAGE_LIMIT = 500
+
+# Headers requested when message bodies are not needed
+METADATA_HEADERS = ['From', 'Subject', 'Date']
+# The only headers _parse_message() reads
+_PARSED_HEADERS = frozenset(METADATA_HEADERS)
+
+# Distinct Date headers whose parsed value is remembered
+DATE_CACHE_SIZE = 4096
+
+# Gmail inbox tabs that correspond to the categorizer's categories
+GMAIL_CATEGORIES = {'promotional': 'promotions', 'social': 'social'}
+
+
+def _is_retryable(error: 'HttpError') -> bool:
+    """Whether a failed request was throttled or hit a transient server error."""
+    status = error.resp.status
+    if status == 429 or status >= 500:
+        return True
+    # Gmail also reports rate limits as 403 rateLimitExceeded/userRateLimitExceeded
+    details = error.error_details if isinstance(error.error_details, list) else []
+    return status == 403 and any(
+        isinstance(detail, dict) and detail.get('reason') in _RATE_LIMIT_REASONS
+        for detail in details
+    )
+
+
+def _retry_delay(retry_after: Optional[str], default: float) -> float:
+    """Seconds to wait as asked by a Retry-After header.
+    
+    The header is either a number of seconds or an HTTP-date; ``default``
+    is used when it is missing or unparseable.
+    """
+    if retry_after is None:
+        return default
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return default
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date_header(value: str) -> Optional[datetime]:
+    """Parse an RFC 2822 Date header, or return None if it is malformed.
+    
+    Cached because bulk mail (digests, autoresponders) often repeats the
+    exact same header.
+    """
+    try:
+        return parsedate_to_datetime(value)
+    except Exception:
+        return None
+
+
+class MessageCache:
+    """On-disk cache of downloaded messages, keyed by Gmail message ID.
+    
+    A message's headers and body never change once it is sent, so later runs
+    can skip downloading them. Labels do change, so callers refresh them from
+    Gmail and only take the rest from the cache. The least recently used
+    messages are dropped once more than max_messages are stored.
+    """
+    
+    def __init__(self, path: str, max_messages: int = 50000):
+        """Open (creating if needed) the cache database.
+        
+        Args:
+            path: SQLite database file
+            max_messages: Most messages kept on disk
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_messages = max_messages
+        # Batches are fetched on worker threads, so access is serialized here
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                "id TEXT PRIMARY KEY, has_body INTEGER, used REAL, data BLOB)"
+            )
+    
+    def get_many(self, message_ids: List[str], need_body: bool) -> Dict[str, Dict[str, Any]]:
+        """Return the cached emails among message_ids, keyed by ID.
+        
+        Emails cached without a body are not returned when need_body is set.
+        """
+        placeholders = ','.join('?' * len(message_ids))
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                f"SELECT id, data FROM messages WHERE id IN ({placeholders}) AND has_body >= ?",
+                (*message_ids, int(need_body))
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE messages SET used = ? WHERE id = ?",
+                [(time.time(), message_id) for message_id, _ in rows]
+            )
+        
+        emails = {}
+        for message_id, data in rows:
+            email = msgpack.unpackb(data, raw=False)
+            email['date'] = datetime.fromisoformat(email['date'])
+            emails[message_id] = email
+        return emails
+    
+    def put_many(self, emails: List[Dict[str, Any]], has_body: bool) -> None:
+        """Store downloaded emails, evicting the least recently used ones."""
+        if not emails:
+            return
+        now = time.time()
+        rows = [
+            (email['id'], int(has_body), now,
+             msgpack.packb(dict(email, date=email['date'].isoformat()), use_bin_type=True))
+            for email in emails
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?)", rows)
+            self._conn.execute(
+                "DELETE FROM messages WHERE id IN (SELECT id FROM messages ORDER BY used "
+                "LIMIT max(0, (SELECT COUNT(*) FROM messages) - ?))",
+                (self.max_messages,)
+            )
+
 
 class GmailConnector:
     """Gmail API connector for fetching and managing emails.
@@ -43,7 +196,7 @@ class GmailConnector:
     ]
     
     def __init__(self, credentials_file: str = 'credentials.json', 
-                 token_file: str = 'token.pickle',
+                 token_file: str = 'token.json',
                  config: Optional[Dict[str, Any]] = None):
         """Initialize Gmail connector.
         
@@ -62,10 +215,21 @@ class GmailConnector:
         gmail_config = self.config.get('gmail', {})
         self.scopes = gmail_config.get('scopes', self.SCOPES)
         self.max_results = gmail_config.get('max_results', 1000)
-        self.batch_size = gmail_config.get('batch_size', 100)
+        # Messages per batch HTTP request, and message IDs per listing page
+        self.batch_size = min(gmail_config.get('batch_size', 50), BATCH_REQUEST_LIMIT)
+        self.list_page_size = min(gmail_config.get('list_page_size', LIST_PAGE_LIMIT), LIST_PAGE_LIMIT)
+        self.max_concurrent_requests = gmail_config.get('max_concurrent_requests', 4)
+        self.max_body_bytes = gmail_config.get('max_body_bytes')
+        
+        cache_file = gmail_config.get('cache_file')
+        self.message_cache = MessageCache(
+            os.path.expanduser(cache_file), gmail_config.get('cache_max_messages', 50000)
+        ) if cache_file else None
         
         self.service = None
         self.creds = None
+        # Label name -> ID, loaded by the first get_labels() call
+        self._label_ids: Optional[Dict[str, str]] = None
         
         logger.info("GmailConnector initialized")
     
@@ -76,10 +240,16 @@ class GmailConnector:
             True if authentication successful
         """
         try:
-            # Load existing token
+            # Load existing token, or one pickled by earlier versions
+            legacy_token_file = os.path.splitext(self.token_file)[0] + '.pickle'
+            save_token = False
             if os.path.exists(self.token_file):
-                with open(self.token_file, 'rb') as token:
+                self.creds = Credentials.from_authorized_user_file(self.token_file, self.scopes)
+            elif legacy_token_file != self.token_file and os.path.exists(legacy_token_file):
+                logger.info(f"Migrating token from {legacy_token_file} to {self.token_file}")
+                with open(legacy_token_file, 'rb') as token:
                     self.creds = pickle.load(token)
+                save_token = True
             
             # If no valid credentials, authenticate
             if not self.creds or not self.creds.valid:
@@ -99,9 +269,10 @@ class GmailConnector:
                     )
                     self.creds = flow.run_local_server(port=0)
                 
-                # Save credentials
-                with open(self.token_file, 'wb') as token:
-                    pickle.dump(self.creds, token)
+                save_token = True
+            
+            if save_token:
+                self._save_token()
             
             # Build service
             self.service = build('gmail', 'v1', credentials=self.creds)
@@ -112,10 +283,22 @@ class GmailConnector:
             logger.error(f"Authentication failed: {e}")
             return False
     
+    def _save_token(self) -> None:
+        """Save credentials as JSON.
+        
+        Written to a temporary file and renamed over the old token, so a
+        crash mid-write never leaves a truncated token behind.
+        """
+        tmp_file = self.token_file + '.tmp'
+        with open(tmp_file, 'w') as token:
+            token.write(self.creds.to_json())
+        os.replace(tmp_file, self.token_file)
+    
     def fetch_emails(self, max_results: Optional[int] = None,
                     query: str = '', 
                     label_ids: Optional[List[str]] = None,
-                    after_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
+                    after_date: Optional[datetime] = None,
+                    include_body: bool = True) -> List[Dict[str, Any]]:
         """Fetch emails from Gmail.
         
         Args:
@@ -123,6 +306,81 @@ class GmailConnector:
             query: Gmail search query (e.g., 'from:example@gmail.com')
             label_ids: List of label IDs to filter by
             after_date: Only fetch emails after this date
+            include_body: Download message bodies; when False only the From,
+                Subject and Date headers are fetched and 'body' is empty
+        
+        Returns:
+            List of email dictionaries
+        """
+        emails = list(self.iter_emails(max_results, query, label_ids, after_date, include_body))
+        logger.info(f"Fetched {len(emails)} emails")
+        return emails
+    
+    def iter_emails(self, max_results: Optional[int] = None,
+                    query: str = '',
+                    label_ids: Optional[List[str]] = None,
+                    after_date: Optional[datetime] = None,
+                    include_body: bool = True) -> Iterator[Dict[str, Any]]:
+        """Yield emails from Gmail as they are downloaded.
+        
+        Takes the same arguments as :meth:`fetch_emails`, but only one page of
+        message IDs and its messages are held at a time, so the result can be
+        streamed straight into :meth:`EmailAnalyzer.analyze`. Message details
+        are downloaded with batch HTTP requests of ``gmail.batch_size``
+        messages each rather than one round trip per message, and up to
+        ``gmail.max_concurrent_requests`` batches run on worker threads while
+        the next page is listed.
+        
+        Yields:
+            Email dictionaries
+        """
+        if not self.service:
+            if not self.authenticate():
+                logger.error("Cannot fetch emails: authentication failed")
+                return
+        
+        max_results = max_results or self.max_results
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_concurrent_requests) as executor:
+                # Batches in flight, oldest first so emails keep listing order
+                pending = deque()
+                for message_ids in self._iter_message_pages(max_results, query, label_ids, after_date):
+                    for start in range(0, len(message_ids), self.batch_size):
+                        chunk = message_ids[start:start + self.batch_size]
+                        # httplib2 is not thread-safe, so each batch gets its own transport
+                        pending.append(executor.submit(
+                            self._fetch_message_batch, chunk, include_body, self._new_http()
+                        ))
+                        if len(pending) >= self.max_concurrent_requests:
+                            yield from pending.popleft().result()
+                
+                while pending:
+                    yield from pending.popleft().result()
+            
+        except HttpError as error:
+            logger.error(f"Error fetching emails: {error}")
+    
+    async def fetch_emails_async(self, max_results: Optional[int] = None,
+                                 query: str = '',
+                                 label_ids: Optional[List[str]] = None,
+                                 after_date: Optional[datetime] = None,
+                                 include_body: bool = True) -> List[Dict[str, Any]]:
+        """Fetch emails from Gmail, downloading message details concurrently.
+        
+        Message listing follows Gmail's page tokens and stays sequential, but
+        each page's messages are downloaded in batch HTTP requests of
+        ``gmail.batch_size`` messages, with up to
+        ``gmail.max_concurrent_requests`` batches in flight to respect
+        Gmail's per-user quota.
+        
+        Args:
+            max_results: Maximum number of emails to fetch
+            query: Gmail search query (e.g., 'from:example@gmail.com')
+            label_ids: List of label IDs to filter by
+            after_date: Only fetch emails after this date
+            include_body: Download message bodies; when False only the From,
+                Subject and Date headers are fetched and 'body' is empty
         
         Returns:
             List of email dictionaries
@@ -133,41 +391,30 @@ class GmailConnector:
                 return []
         
         max_results = max_results or self.max_results
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
         emails = []
         
+        async def fetch_batch(message_ids: List[str]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                # httplib2 is not thread-safe, so each batch gets its own transport
+                return await loop.run_in_executor(
+                    None, self._fetch_message_batch, message_ids, include_body, self._new_http()
+                )
+        
         try:
-            # Build query
-            if after_date:
-                date_str = after_date.strftime('%Y/%m/%d')
-                query += f" after:{date_str}"
-            
-            logger.info(f"Fetching emails with query: '{query}'")
-            
-            # List messages
-            page_token = None
-            while len(emails) < max_results:
-                results = self.service.users().messages().list(
-                    userId='me',
-                    q=query,
-                    labelIds=label_ids,
-                    maxResults=min(self.batch_size, max_results - len(emails)),
-                    pageToken=page_token
-                ).execute()
-                
-                messages = results.get('messages', [])
-                
-                if not messages:
+            pages = self._iter_message_pages(max_results, query, label_ids, after_date)
+            while True:
+                message_ids = await loop.run_in_executor(None, next, pages, None)
+                if message_ids is None:
                     break
                 
-                # Fetch full message details
-                for message in messages:
-                    email_data = self._fetch_message_details(message['id'])
-                    if email_data:
-                        emails.append(email_data)
-                
-                page_token = results.get('nextPageToken')
-                if not page_token:
-                    break
+                batches = await asyncio.gather(*(
+                    fetch_batch(message_ids[start:start + self.batch_size])
+                    for start in range(0, len(message_ids), self.batch_size)
+                ))
+                for batch in batches:
+                    emails.extend(batch)
             
             logger.info(f"Fetched {len(emails)} emails")
             return emails
@@ -176,45 +423,210 @@ class GmailConnector:
             logger.error(f"Error fetching emails: {error}")
             return emails
     
-    def _fetch_message_details(self, message_id: str) -> Optional[Dict[str, Any]]:
-        """Fetch detailed information for a specific message."""
-        try:
-            message = self.service.users().messages().get(
+    @staticmethod
+    def build_query(criteria: Dict[str, str]) -> Optional[str]:
+        """Translate suggestion filter criteria into a Gmail search query.
+        
+        Lets Gmail select the matching messages server-side, e.g.
+        ``fetch_emails(query=GmailConnector.build_query(s['filter_criteria']))``
+        lists only the emails a suggested filter would affect.
+        
+        Args:
+            criteria: 'filter_criteria' of a FilterSuggester suggestion
+        
+        Returns:
+            Gmail search query, or None if a criterion has no Gmail search
+            equivalent (such as the 'work' category) and the emails have to
+            be filtered locally instead
+        """
+        def phrase(value: str) -> str:
+            value = value.replace('"', '')
+            return f'"{value}"' if ' ' in value else value
+        
+        terms = []
+        for key, value in criteria.items():
+            if key == 'from':
+                terms.append(f"from:{phrase(value)}")
+            elif key == 'subject':
+                terms.append(f"subject:{phrase(value)}")
+            elif key == 'body_contains':
+                terms.append(phrase(value))
+            elif key == 'category' and value in GMAIL_CATEGORIES:
+                terms.append(f"category:{GMAIL_CATEGORIES[value]}")
+            else:
+                return None
+        return ' '.join(terms)
+    
+    def _iter_message_pages(self, max_results: int, query: str,
+                            label_ids: Optional[List[str]],
+                            after_date: Optional[datetime]) -> Iterator[List[str]]:
+        """Yield message IDs one result page at a time."""
+        # Build query
+        if after_date:
+            date_str = after_date.strftime('%Y/%m/%d')
+            query += f" after:{date_str}"
+        
+        logger.info(f"Fetching emails with query: '{query}'")
+        
+        # List messages
+        listed = 0
+        page_token = None
+        while listed < max_results:
+            results = self.service.users().messages().list(
                 userId='me',
-                id=message_id,
-                format='full'
+                q=query,
+                labelIds=label_ids,
+                maxResults=min(self.list_page_size, max_results - listed),
+                pageToken=page_token
             ).execute()
             
-            # Extract headers
-            headers = {h['name']: h['value'] for h in message['payload']['headers']}
+            messages = results.get('messages', [])
             
-            # Extract body
-            body = self._extract_body(message['payload'])
+            if not messages:
+                break
             
-            # Parse date
-            date_str = headers.get('Date', '')
-            try:
-                from email.utils import parsedate_to_datetime
-                date = parsedate_to_datetime(date_str)
-            except:
-                date = datetime.now()
+            listed += len(messages)
+            yield [message['id'] for message in messages]
             
-            return {
-                'id': message['id'],
-                'thread_id': message['threadId'],
-                'sender': headers.get('From', ''),
-                'subject': headers.get('Subject', ''),
-                'date': date,
-                'body': body,
-                'labels': message.get('labelIds', []),
-                'size': int(message.get('sizeEstimate', 0)),
-                'snippet': message.get('snippet', '')
-            }
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+    
+    def _new_http(self):
+        """Create an authorized HTTP transport for use on a worker thread."""
+        return google_auth_httplib2.AuthorizedHttp(self.creds, http=httplib2.Http())
+    
+    def _message_request(self, message_id: str, include_body: bool = True):
+        """Build the messages.get request for one message."""
+        if include_body:
+            return self.service.users().messages().get(
+                userId='me', id=message_id, format='full'
+            )
+        return self.service.users().messages().get(
+            userId='me', id=message_id, format='metadata',
+            metadataHeaders=METADATA_HEADERS
+        )
+    
+    def _labels_request(self, message_id: str):
+        """Build the messages.get request for just a message's labels."""
+        return self.service.users().messages().get(
+            userId='me', id=message_id, format='minimal'
+        )
+    
+    def _cache_for(self, include_body: bool) -> Optional[MessageCache]:
+        """Return the message cache, unless bodies are being truncated."""
+        if include_body and self.max_body_bytes is not None:
+            return None
+        return self.message_cache
+    
+    def _fetch_message_batch(self, message_ids: List[str], include_body: bool = True,
+                             http=None) -> List[Dict[str, Any]]:
+        """Fetch several messages in a single batch HTTP request.
+        
+        Messages that fail are logged and skipped, like in
+        _fetch_message_details(); the rest are returned in request order.
+        Messages found in the message cache only have their labels fetched.
+        Sub-requests that Gmail throttles (429, or 403 rate limit) or that
+        fail with a 5xx status are resent, up to BATCH_RETRIES times, after
+        the longest Retry-After any of them asked for.
+        """
+        cache = self._cache_for(include_body)
+        cached = cache.get_many(message_ids, include_body) if cache else {}
+        messages = {}
+        
+        pending = message_ids
+        for attempt in range(BATCH_RETRIES + 1):
+            retry = []
+            wait = 0.0
+            
+            def collect(request_id: str, response: Dict[str, Any], exception) -> None:
+                nonlocal wait
+                if exception is None:
+                    messages[request_id] = response
+                elif _is_retryable(exception) and attempt < BATCH_RETRIES:
+                    retry.append(request_id)
+                    wait = max(wait, _retry_delay(exception.resp.get('retry-after'), 2 ** attempt))
+                else:
+                    logger.warning(f"Error fetching message {request_id}: {exception}")
+            
+            batch = self.service.new_batch_http_request(callback=collect)
+            for message_id in pending:
+                if message_id in cached:
+                    batch.add(self._labels_request(message_id), request_id=message_id)
+                else:
+                    batch.add(self._message_request(message_id, include_body), request_id=message_id)
+            batch.execute(http=http)
+            
+            if not retry:
+                break
+            logger.info(f"Retrying {len(retry)} throttled message requests in {wait:.0f}s")
+            time.sleep(wait)
+            pending = retry
+        
+        emails = []
+        downloaded = []
+        for message_id in message_ids:
+            if message_id not in messages:
+                continue
+            if message_id in cached:
+                email = cached[message_id]
+                email['labels'] = messages[message_id].get('labelIds', [])
+            else:
+                email = self._parse_message(messages[message_id])
+                downloaded.append(email)
+            emails.append(email)
+        
+        if cache:
+            cache.put_many(downloaded, include_body)
+        return emails
+    
+    def _fetch_message_details(self, message_id: str, http=None,
+                               include_body: bool = True) -> Optional[Dict[str, Any]]:
+        """Fetch detailed information for a specific message."""
+        cache = self._cache_for(include_body)
+        try:
+            email = cache.get_many([message_id], include_body).get(message_id) if cache else None
+            if email is not None:
+                message = self._labels_request(message_id).execute(http=http)
+                email['labels'] = message.get('labelIds', [])
+                return email
+            
+            message = self._message_request(message_id, include_body).execute(http=http)
+            email = self._parse_message(message)
+            if cache:
+                cache.put_many([email], include_body)
+            return email
             
         except HttpError as error:
             logger.warning(f"Error fetching message {message_id}: {error}")
             return None
     
+    def _parse_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a Gmail API message resource into an email dictionary."""
+        # Extract headers, keeping only the ones used below (last one wins on duplicates)
+        headers = {h['name']: h['value'] for h in message['payload']['headers']
+                   if h['name'] in _PARSED_HEADERS}
+        
+        # Extract body
+        body = self._extract_body(message['payload'])
+        
+        # Parse date
+        date = _parse_date_header(headers.get('Date', '')) or datetime.now()
+        
+        # Senders and threads repeat across many messages; interning makes
+        # every email share one copy of each string
+        return {
+            'id': message['id'],
+            'thread_id': sys.intern(message['threadId']),
+            'sender': sys.intern(headers.get('From', '')),
+            'subject': headers.get('Subject', ''),
+            'date': date,
+            'body': body,
+            'labels': message.get('labelIds', []),
+            'size': int(message.get('sizeEstimate', 0)),
+            'snippet': message.get('snippet', '')
+        }
+    
     def _extract_body(self, payload: Dict[str, Any]) -> str:
         """Extract email body from message payload."""
         body = ''
@@ -223,17 +635,26 @@ class GmailConnector:
             for part in payload['parts']:
                 if part['mimeType'] == 'text/plain':
                     if 'data' in part['body']:
-                        body = base64.urlsafe_b64decode(part['body']['data']).decode('utf-8', errors='ignore')
+                        body = self._decode_body(part['body']['data'])
                         break
                 elif 'parts' in part:
                     body = self._extract_body(part)
                     if body:
                         break
         elif 'body' in payload and 'data' in payload['body']:
-            body = base64.urlsafe_b64decode(payload['body']['data']).decode('utf-8', errors='ignore')
+            body = self._decode_body(payload['body']['data'])
         
         return body
     
+    def _decode_body(self, data: str) -> str:
+        """Decode base64url body data, keeping at most gmail.max_body_bytes."""
+        if self.max_body_bytes is not None:
+            # Every 4 base64 characters decode to 3 bytes, so only the
+            # prefix that covers max_body_bytes is decoded
+            data = data[:-(-self.max_body_bytes // 3) * 4]
+            return base64.urlsafe_b64decode(data)[:self.max_body_bytes].decode('utf-8', errors='ignore')
+        return base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
+    
     def get_labels(self) -> List[Dict[str, Any]]:
         """Get all Gmail labels.
         
@@ -248,6 +669,7 @@ class GmailConnector:
             results = self.service.users().labels().list(userId='me').execute()
             labels = results.get('labels', [])
             logger.info(f"Retrieved {len(labels)} labels")
+            self._label_ids = {label['name']: label['id'] for label in labels}
             return labels
         except HttpError as error:
             logger.error(f"Error fetching labels: {error}")
@@ -279,17 +701,31 @@ class GmailConnector:
             ).execute()
             
             logger.info(f"Created label: {label_name}")
+            if self._label_ids is not None:
+                self._label_ids[label_name] = result['id']
             return result['id']
             
         except HttpError as error:
             logger.error(f"Error creating label: {error}")
             return None
     
+    def _resolve_labels(self, labels: List[str]) -> List[str]:
+        """Translate label names to label IDs, passing IDs through unchanged.
+        
+        System labels such as INBOX are named after their IDs. The name to ID
+        mapping is fetched once and then kept up to date by create_label().
+        """
+        if self._label_ids is None:
+            self.get_labels()
+        label_ids = self._label_ids or {}
+        return [label_ids.get(label, label) for label in labels]
+    
     def apply_filter(self, filter_config: Dict[str, Any]) -> bool:
         """Apply a filter to Gmail.
         
         Args:
-            filter_config: Filter configuration with criteria and actions
+            filter_config: Filter configuration with criteria and actions;
+                labels in the action may be given by name or ID
         
         Returns:
             True if successful
@@ -301,7 +737,7 @@ class GmailConnector:
         try:
             result = self.service.users().settings().filters().create(
                 userId='me',
-                body=filter_config
+                body=self._resolve_filter(filter_config)
             ).execute()
             
             logger.info(f"Applied filter: {result['id']}")
@@ -311,6 +747,51 @@ class GmailConnector:
             logger.error(f"Error applying filter: {error}")
             return False
     
+    def apply_filters(self, filter_configs: List[Dict[str, Any]]) -> List[bool]:
+        """Apply several filters to Gmail using batch HTTP requests.
+        
+        Args:
+            filter_configs: Filter configurations, as for apply_filter()
+        
+        Returns:
+            Whether each filter was applied, in the same order
+        """
+        if not self.service:
+            if not self.authenticate():
+                return [False] * len(filter_configs)
+        
+        applied = [False] * len(filter_configs)
+        
+        def collect(request_id: str, response: Dict[str, Any], exception) -> None:
+            if exception is not None:
+                logger.error(f"Error applying filter: {exception}")
+            else:
+                logger.info(f"Applied filter: {response['id']}")
+                applied[int(request_id)] = True
+        
+        try:
+            for start in range(0, len(filter_configs), BATCH_REQUEST_LIMIT):
+                batch = self.service.new_batch_http_request(callback=collect)
+                for index in range(start, min(start + BATCH_REQUEST_LIMIT, len(filter_configs))):
+                    batch.add(self.service.users().settings().filters().create(
+                        userId='me',
+                        body=self._resolve_filter(filter_configs[index])
+                    ), request_id=str(index))
+                batch.execute()
+        
+        except HttpError as error:
+            logger.error(f"Error applying filters: {error}")
+        
+        return applied
+    
+    def _resolve_filter(self, filter_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of filter_config with action label names resolved to IDs."""
+        action = filter_config.get('action', {})
+        for key in ('addLabelIds', 'removeLabelIds'):
+            if action.get(key):
+                action = dict(action, **{key: self._resolve_labels(action[key])})
+        return dict(filter_config, action=action)
+    
     def modify_message(self, message_id: str, 
                       add_labels: Optional[List[str]] = None,
                       remove_labels: Optional[List[str]] = None) -> bool:
@@ -318,8 +799,8 @@ class GmailConnector:
         
         Args:
             message_id: ID of the message to modify
-            add_labels: List of label IDs to add
-            remove_labels: List of label IDs to remove
+            add_labels: List of label names or IDs to add
+            remove_labels: List of label names or IDs to remove
         
         Returns:
             True if successful
@@ -331,9 +812,9 @@ class GmailConnector:
         try:
             body = {}
             if add_labels:
-                body['addLabelIds'] = add_labels
+                body['addLabelIds'] = self._resolve_labels(add_labels)
             if remove_labels:
-                body['removeLabelIds'] = remove_labels
+                body['removeLabelIds'] = self._resolve_labels(remove_labels)
             
             self.service.users().messages().modify(
                 userId='me',
@@ -4,12 +4,19 @@ Provides connection and data fetching capabilities for Outlook using
 the Microsoft Graph API with OAuth 2.0 authentication.
 """
 
+import asyncio
 import logging
 import os
 import json
-from typing import Dict, List, Any, Optional
+import sys
+import time
+from functools import partial
+from typing import Dict, Iterator, List, Any, Optional
 from datetime import datetime, timedelta
+import msgpack
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 try:
     import msal
@@ -18,8 +25,40 @@ except ImportError:
     MSAL_AVAILABLE = False
     logging.warning("MSAL library not installed. Outlook functionality will be limited.")
 
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Connections kept open to graph.microsoft.com
+POOL_MAXSIZE = 16
+
+# MSAL token cache, shared by every connector in the working directory
+TOKEN_CACHE_FILE = 'outlook_token_cache.bin'
+# Messages and deltaLink per folder kept by sync_emails() between runs
+DELTA_STATE_FILE = 'outlook_delta_state.msgpack'
+
+# Messages requested per page of results
+PAGE_SIZE = 100
+# Message properties selected when listing messages, besides the body
+MESSAGE_FIELDS = 'id,subject,from,receivedDateTime,bodyPreview,conversationId,internetMessageId'
+# Stand-in for absent nested objects when reading message fields
+_EMPTY = {}
+
+# Most sub-requests Graph accepts in one JSON $batch request
+BATCH_REQUEST_LIMIT = 20
+# Rounds of resending $batch sub-requests that were throttled or hit 5xx
+BATCH_RETRIES = 3
+
+# Idempotent requests (GET, DELETE, ...) are retried on throttling and
+# transient server errors, honouring Graph's Retry-After header
+RETRY_POLICY = Retry(total=5, backoff_factor=0.5,
+                     status_forcelist=(429, 500, 502, 503, 504),
+                     respect_retry_after_header=True)
+
 
 class OutlookConnector:
     """Outlook/Microsoft Graph API connector.
@@ -64,12 +103,43 @@ class OutlookConnector:
         outlook_config = self.config.get('outlook', {})
         self.scopes = outlook_config.get('scopes', self.SCOPES)
         self.max_results = outlook_config.get('max_results', 1000)
+        self.max_concurrent_requests = outlook_config.get('max_concurrent_requests', 8)
+        self.delta_state_file = outlook_config.get('delta_state_file', DELTA_STATE_FILE)
+        self._delta_state = None  # Loaded on first sync_emails()
+        # Per folder, message id -> (raw message, parsed email) from the last sync
+        self._synced_emails = {}
         
         self.access_token = None
+        
+        # Read the token cache once; it is written back only when MSAL changes it
         self.token_cache = msal.SerializableTokenCache()
+        self._cache_file = TOKEN_CACHE_FILE
+        if os.path.exists(self._cache_file):
+            with open(self._cache_file, 'r') as f:
+                self.token_cache.deserialize(f.read())
+        # MSAL app, created on first use since that contacts the authority
+        self._app = None
+        
+        # One session for all Graph calls, so connections (and their TLS
+        # handshakes) are reused instead of opened per request
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(
+            pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=RETRY_POLICY
+        ))
+        self._session.headers['Content-Type'] = 'application/json'
         
         logger.info("OutlookConnector initialized")
     
+    def close(self) -> None:
+        """Close the pooled connections to the Graph API."""
+        self._session.close()
+    
+    def __enter__(self) -> 'OutlookConnector':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
     def authenticate(self, use_device_flow: bool = False) -> bool:
         """Authenticate with Microsoft Graph API.
         
@@ -80,29 +150,12 @@ class OutlookConnector:
             True if authentication successful
         """
         try:
-            # Load token cache if exists
-            cache_file = 'outlook_token_cache.bin'
-            if os.path.exists(cache_file):
-                self.token_cache.deserialize(open(cache_file, 'r').read())
-            
-            # Create MSAL app
-            app = msal.PublicClientApplication(
-                self.client_id,
-                authority=f"https://login.microsoftonline.com/{self.tenant_id}",
-                token_cache=self.token_cache
-            )
-            
             # Try to get token from cache
-            accounts = app.get_accounts()
-            if accounts:
-                logger.info("Attempting to acquire token silently")
-                result = app.acquire_token_silent(self.scopes, account=accounts[0])
-                if result:
-                    self.access_token = result['access_token']
-                    logger.info("Successfully acquired token from cache")
-                    return True
+            if self._acquire_token_silent():
+                return True
             
             # Need to authenticate
+            app = self._get_app()
             if use_device_flow:
                 flow = app.initiate_device_flow(scopes=self.scopes)
                 if "user_code" not in flow:
@@ -115,10 +168,7 @@ class OutlookConnector:
             
             if "access_token" in result:
                 self.access_token = result['access_token']
-                
-                # Save token cache
-                with open(cache_file, 'w') as f:
-                    f.write(self.token_cache.serialize())
+                self._save_token_cache()
                 
                 logger.info("Successfully authenticated with Microsoft Graph API")
                 return True
@@ -130,10 +180,82 @@ class OutlookConnector:
             logger.error(f"Authentication failed: {e}")
             return False
     
+    def _get_app(self) -> 'msal.PublicClientApplication':
+        """Return the MSAL app, creating it on first use."""
+        if self._app is None:
+            self._app = msal.PublicClientApplication(
+                self.client_id,
+                authority=f"https://login.microsoftonline.com/{self.tenant_id}",
+                token_cache=self.token_cache
+            )
+        return self._app
+    
+    def _acquire_token_silent(self, force_refresh: bool = False) -> bool:
+        """Get a token from the cache, refreshing it if needed.
+        
+        Args:
+            force_refresh: Redeem the refresh token even if the cached
+                access token has not expired yet
+        
+        Returns:
+            True if a token was acquired without user interaction
+        """
+        app = self._get_app()
+        accounts = app.get_accounts()
+        if not accounts:
+            return False
+        
+        logger.info("Attempting to acquire token silently")
+        result = app.acquire_token_silent(self.scopes, account=accounts[0],
+                                          force_refresh=force_refresh)
+        if not result or 'access_token' not in result:
+            return False
+        
+        self.access_token = result['access_token']
+        self._save_token_cache()
+        logger.info("Successfully acquired token from cache")
+        return True
+    
+    def _ensure_token(self, force: bool = False) -> Optional[str]:
+        """Return an access token, authenticating only when there is none.
+        
+        Args:
+            force: Replace the current token, e.g. after Graph rejected it
+        
+        Returns:
+            The access token, or None if authentication failed
+        """
+        if force:
+            # Only a silent refresh here; never prompt the user mid-request
+            try:
+                if self._acquire_token_silent(force_refresh=True):
+                    return self.access_token
+            except Exception as e:
+                logger.error(f"Token refresh failed: {e}")
+            return None
+        
+        if self.access_token:
+            return self.access_token
+        return self.access_token if self.authenticate() else None
+    
+    def _save_token_cache(self) -> None:
+        """Write the token cache back to disk if MSAL changed it.
+        
+        Written to a temporary file and renamed over the old cache, so a
+        crash mid-write never leaves a truncated cache behind.
+        """
+        if not self.token_cache.has_state_changed:
+            return
+        tmp_file = self._cache_file + '.tmp'
+        with open(tmp_file, 'w') as f:
+            f.write(self.token_cache.serialize())
+        os.replace(tmp_file, self._cache_file)
+    
     def fetch_emails(self, max_results: Optional[int] = None,
                     filter_query: Optional[str] = None,
                     folder_id: str = 'inbox',
-                    after_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
+                    after_date: Optional[datetime] = None,
+                    include_body: bool = True) -> List[Dict[str, Any]]:
         """Fetch emails from Outlook.
         
         Args:
@@ -141,36 +263,21 @@ class OutlookConnector:
             filter_query: OData filter query
             folder_id: Folder ID or name (default: 'inbox')
             after_date: Only fetch emails after this date
+            include_body: Download full message bodies; when False 'body'
+                holds Graph's plain-text preview (up to 255 characters)
         
         Returns:
             List of email dictionaries
         """
-        if not self.access_token:
-            if not self.authenticate():
-                logger.error("Cannot fetch emails: authentication failed")
-                return []
+        if not self._ensure_token():
+            logger.error("Cannot fetch emails: authentication failed")
+            return []
         
         max_results = max_results or self.max_results
         emails = []
         
         try:
-            # Build query parameters
-            params = {
-                '$top': min(100, max_results),
-                '$select': 'id,subject,from,receivedDateTime,bodyPreview,body,conversationId,internetMessageId',
-                '$orderby': 'receivedDateTime DESC'
-            }
-            
-            # Add filter
-            filters = []
-            if after_date:
-                date_str = after_date.strftime('%Y-%m-%dT%H:%M:%SZ')
-                filters.append(f"receivedDateTime ge {date_str}")
-            if filter_query:
-                filters.append(filter_query)
-            
-            if filters:
-                params['$filter'] = ' and '.join(filters)
+            params = self._message_params(max_results, filter_query, after_date, include_body)
             
             logger.info(f"Fetching emails from {folder_id}")
             
@@ -178,16 +285,24 @@ class OutlookConnector:
             url = f"{self.GRAPH_API_ENDPOINT}/me/mailFolders/{folder_id}/messages"
             
             while len(emails) < max_results:
-                response = self._make_request('GET', url, params=params)
-                
-                if not response:
-                    break
-                
-                messages = response.get('value', [])
+                if IJSON_AVAILABLE:
+                    # Parse messages off the wire one at a time rather than
+                    # loading the whole page (bodies included) first
+                    response = {}
+                    messages = self._stream_messages(url, params, response)
+                else:
+                    response = self._make_request('GET', url, params=params)
+                    
+                    if not response:
+                        break
+                    
+                    messages = response.get('value', [])
                 
                 for message in messages:
                     email_data = self._parse_message(message)
                     emails.append(email_data)
+                    if len(emails) >= max_results:
+                        break
                 
                 # Check for next page
                 next_link = response.get('@odata.nextLink')
@@ -204,58 +319,315 @@ class OutlookConnector:
             logger.error(f"Error fetching emails: {e}")
             return emails
     
+    async def fetch_emails_async(self, max_results: Optional[int] = None,
+                                 filter_query: Optional[str] = None,
+                                 folder_id: str = 'inbox',
+                                 after_date: Optional[datetime] = None,
+                                 include_body: bool = True) -> List[Dict[str, Any]]:
+        """Fetch emails from Outlook, downloading result pages concurrently.
+        
+        The matching messages are counted first, so every page can be
+        requested at once by offset instead of following each page's
+        nextLink in turn. Requests are bounded by
+        ``outlook.max_concurrent_requests`` to stay within Graph throttling.
+        Takes the same arguments as :meth:`fetch_emails`.
+        
+        Returns:
+            List of email dictionaries, newest first
+        """
+        if not self._ensure_token():
+            logger.error("Cannot fetch emails: authentication failed")
+            return []
+        
+        max_results = max_results or self.max_results
+        loop = asyncio.get_running_loop()
+        params = self._message_params(max_results, filter_query, after_date, include_body)
+        url = f"{self.GRAPH_API_ENDPOINT}/me/mailFolders/{folder_id}/messages"
+        
+        count_params = {'$filter': params['$filter']} if '$filter' in params else None
+        total = await loop.run_in_executor(
+            None, partial(self._make_request, 'GET', f"{url}/$count", params=count_params)
+        )
+        if not isinstance(total, int):
+            logger.warning("Could not count messages, fetching pages one by one")
+            return await loop.run_in_executor(
+                None, self.fetch_emails, max_results, filter_query, folder_id, after_date,
+                include_body
+            )
+        total = min(total, max_results)
+        
+        logger.info(f"Fetching {total} emails from {folder_id}")
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        
+        async def fetch_page(skip: int) -> Optional[Dict[str, Any]]:
+            page_params = dict(params, **{'$top': min(PAGE_SIZE, total - skip), '$skip': skip})
+            async with semaphore:
+                return await loop.run_in_executor(
+                    None, partial(self._make_request, 'GET', url, params=page_params)
+                )
+        
+        # gather() keeps page order, so emails stay newest first
+        pages = await asyncio.gather(*(fetch_page(skip) for skip in range(0, total, PAGE_SIZE)))
+        emails = [self._parse_message(message)
+                  for page in pages if page
+                  for message in page.get('value', [])]
+        
+        logger.info(f"Fetched {len(emails)} emails")
+        return emails
+    
+    def sync_emails(self, folder_id: str = 'inbox',
+                    include_body: bool = True) -> List[Dict[str, Any]]:
+        """Fetch all emails in a folder, downloading only what changed since the last sync.
+        
+        Uses Graph delta queries. The first sync of a folder downloads every
+        message; the messages and the returned deltaLink are saved to
+        ``outlook.delta_state_file``, so later syncs (also in later runs)
+        only download messages added or changed since, and drop deleted ones.
+        
+        Args:
+            folder_id: Folder ID or name (default: 'inbox')
+            include_body: Download full message bodies; changing this starts
+                the folder's sync over
+        
+        Returns:
+            List of email dictionaries for the whole folder, newest first
+        """
+        if not self._ensure_token():
+            logger.error("Cannot sync emails: authentication failed")
+            return []
+        
+        if self._delta_state is None:
+            self._delta_state = self._load_delta_state()
+        
+        folder = self._delta_state.get(folder_id)
+        if folder is not None and folder['include_body'] == include_body:
+            messages = self._sync_folder(folder_id, include_body, dict(folder['messages']),
+                                         folder['delta_link'])
+            if messages is None:
+                logger.warning(f"Delta sync of {folder_id} failed, starting over")
+        else:
+            messages = None
+        if messages is None:
+            messages = self._sync_folder(folder_id, include_body, {})
+            if messages is None:
+                logger.error(f"Could not sync {folder_id}")
+                return []
+        
+        # Reuse the emails parsed by the previous sync unless the delta
+        # replaced their message; callers get copies they are free to modify
+        previous = self._synced_emails.get(folder_id, {})
+        parsed = {}
+        emails = []
+        # ISO 8601 UTC timestamps sort chronologically as strings
+        for message in sorted(messages.values(),
+                              key=lambda m: m.get('receivedDateTime', ''), reverse=True):
+            entry = previous.get(message['id'])
+            if entry is None or entry[0] is not message:
+                entry = (message, self._parse_message(message))
+            parsed[message['id']] = entry
+            emails.append(dict(entry[1]))
+        self._synced_emails[folder_id] = parsed
+        logger.info(f"Synced {len(emails)} emails in {folder_id}")
+        return emails
+    
+    def _sync_folder(self, folder_id: str, include_body: bool, messages: Dict[str, Any],
+                     delta_link: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Apply a folder's delta pages to ``messages`` (raw Graph messages by id).
+        
+        Starts a new delta query when no ``delta_link`` is given. The
+        folder's state is saved only once the final page, which carries the
+        next deltaLink, has been applied.
+        
+        Returns:
+            The updated messages, or None if a request failed
+        """
+        if delta_link:
+            url, params = delta_link, None
+        else:
+            url = f"{self.GRAPH_API_ENDPOINT}/me/mailFolders/{folder_id}/messages/delta"
+            params = {'$select': MESSAGE_FIELDS + ',body' if include_body else MESSAGE_FIELDS}
+        # Delta queries ignore $top; the page size is requested in a header
+        headers = {'Prefer': f'odata.maxpagesize={PAGE_SIZE}'}
+        
+        while True:
+            response = self._make_request('GET', url, params=params, headers=headers)
+            if response is None:
+                return None
+            
+            for message in response.get('value', []):
+                if '@removed' in message:
+                    messages.pop(message['id'], None)
+                else:
+                    messages[message['id']] = message
+            
+            # Pages carry a nextLink until the last, which has the deltaLink
+            url = response.get('@odata.nextLink')
+            if not url:
+                break
+            params = None
+        
+        self._delta_state[folder_id] = {
+            'include_body': include_body,
+            'delta_link': response.get('@odata.deltaLink'),
+            'messages': messages
+        }
+        self._save_delta_state()
+        return messages
+    
+    def _load_delta_state(self) -> Dict[str, Any]:
+        """Load the saved delta sync state, or start empty."""
+        try:
+            with open(self.delta_state_file, 'rb') as f:
+                return msgpack.unpackb(f.read(), raw=False)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable delta state {self.delta_state_file}: {e}")
+            return {}
+    
+    def _save_delta_state(self) -> None:
+        """Save the delta sync state.
+        
+        Written to a temporary file and renamed over the old state, so a
+        crash mid-write never leaves a truncated state file behind.
+        """
+        tmp_file = self.delta_state_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(msgpack.packb(self._delta_state, use_bin_type=True))
+        os.replace(tmp_file, self.delta_state_file)
+    
+    def _message_params(self, max_results: int, filter_query: Optional[str],
+                        after_date: Optional[datetime],
+                        include_body: bool = True) -> Dict[str, Any]:
+        """Build the query parameters for listing messages."""
+        params = {
+            '$top': min(PAGE_SIZE, max_results),
+            # The HTML body is usually most of each message's payload
+            '$select': MESSAGE_FIELDS + ',body' if include_body else MESSAGE_FIELDS,
+            '$orderby': 'receivedDateTime DESC'
+        }
+        
+        # Add filter
+        filters = []
+        if after_date:
+            date_str = after_date.strftime('%Y-%m-%dT%H:%M:%SZ')
+            filters.append(f"receivedDateTime ge {date_str}")
+        if filter_query:
+            filters.append(filter_query)
+        
+        if filters:
+            params['$filter'] = ' and '.join(filters)
+        return params
+    
     def _parse_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """Parse Outlook message to standard format."""
-        # Parse date
+        # Parse date (fromisoformat only accepts a trailing 'Z' from Python 3.11)
         date_str = message.get('receivedDateTime', '')
         try:
             date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        except:
+        except (AttributeError, ValueError):
             date = datetime.now()
         
-        # Extract sender
-        sender_info = message.get('from', {}).get('emailAddress', {})
+        # Extract sender; Graph sends null 'from' for some drafts
+        sender_info = (message.get('from') or _EMPTY).get('emailAddress') or _EMPTY
         sender = sender_info.get('address', 'unknown@unknown.com')
         
+        # Senders and conversations repeat across many messages; interning
+        # makes every email share one copy of each string
+        sender = sys.intern(sender)
+        thread_id = sys.intern(message.get('conversationId', ''))
+        
         # Extract body
-        body_content = message.get('body', {})
-        body = body_content.get('content', message.get('bodyPreview', ''))
+        preview = message.get('bodyPreview', '')
+        body = (message.get('body') or _EMPTY).get('content', preview)
         
         return {
             'id': message.get('id', ''),
-            'thread_id': message.get('conversationId', ''),
+            'thread_id': thread_id,
             'sender': sender,
             'subject': message.get('subject', ''),
             'date': date,
             'body': body,
             'labels': [],  # Outlook uses categories instead
             'size': len(body),
-            'snippet': message.get('bodyPreview', '')[:200]
+            'snippet': preview[:200]
         }
     
+    def _stream_messages(self, url: str, params: Optional[Dict],
+                         page: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield the messages of one result page as they are parsed.
+        
+        The response is read incrementally with ijson, so only one message
+        is held in memory at a time instead of the whole page.
+        
+        Args:
+            url: Messages URL or nextLink
+            params: Query parameters
+            page: Receives the page's '@odata.nextLink', if it has one
+        """
+        try:
+            response = self._send('GET', url, params=params, stream=True)
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"HTTP error: {e}")
+            return
+        except Exception as e:
+            logger.error(f"Request failed: {e}")
+            return
+        
+        with response:
+            response.raw.decode_content = True
+            builder = None
+            for prefix, event, value in ijson.parse(response.raw, use_float=True):
+                if builder is not None:
+                    builder.event(event, value)
+                    if prefix == 'value.item' and event == 'end_map':
+                        yield builder.value
+                        builder = None
+                elif prefix == 'value.item' and event == 'start_map':
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                elif prefix == '@odata.nextLink':
+                    page['@odata.nextLink'] = value
+    
+    def _send(self, method: str, url: str, params: Optional[Dict] = None,
+              json_data: Optional[Dict] = None, stream: bool = False,
+              headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """Send an authenticated request, raising HTTPError on an error status.
+        
+        If Graph rejects the token (401), it is refreshed and the request
+        retried once.
+        """
+        # Set per request, since authenticate() may have replaced the token
+        headers = dict(headers or {}, Authorization=f'Bearer {self.access_token}')
+        response = self._session.request(method, url, headers=headers, params=params,
+                                         json=json_data, stream=stream)
+        
+        # The token expired or was revoked mid-session: refresh it and retry once
+        if response.status_code == 401 and self._ensure_token(force=True):
+            response.close()
+            headers['Authorization'] = f'Bearer {self.access_token}'
+            response = self._session.request(method, url, headers=headers, params=params,
+                                             json=json_data, stream=stream)
+        
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            response.close()
+            raise
+        return response
+    
     def _make_request(self, method: str, url: str, 
                      params: Optional[Dict] = None,
-                     json_data: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
+                     json_data: Optional[Dict] = None,
+                     headers: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
         """Make authenticated request to Microsoft Graph API."""
-        headers = {
-            'Authorization': f'Bearer {self.access_token}',
-            'Content-Type': 'application/json'
-        }
+        if method not in ('GET', 'POST', 'PATCH', 'DELETE'):
+            logger.error(f"Unsupported method: {method}")
+            return None
         
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers, params=params)
-            elif method == 'POST':
-                response = requests.post(url, headers=headers, json=json_data)
-            elif method == 'PATCH':
-                response = requests.patch(url, headers=headers, json=json_data)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=headers)
-            else:
-                logger.error(f"Unsupported method: {method}")
-                return None
-            
-            response.raise_for_status()
+            response = self._send(method, url, params=params, json_data=json_data,
+                                  headers=headers)
             
             if response.content:
                 return response.json()
@@ -274,9 +646,8 @@ class OutlookConnector:
         Returns:
             List of folder dictionaries
         """
-        if not self.access_token:
-            if not self.authenticate():
-                return []
+        if not self._ensure_token():
+            return []
         
         url = f"{self.GRAPH_API_ENDPOINT}/me/mailFolders"
         response = self._make_request('GET', url)
@@ -298,9 +669,8 @@ class OutlookConnector:
         Returns:
             Folder ID if successful
         """
-        if not self.access_token:
-            if not self.authenticate():
-                return None
+        if not self._ensure_token():
+            return None
         
         if parent_folder_id:
             url = f"{self.GRAPH_API_ENDPOINT}/me/mailFolders/{parent_folder_id}/childFolders"
@@ -327,9 +697,8 @@ class OutlookConnector:
         Returns:
             True if successful
         """
-        if not self.access_token:
-            if not self.authenticate():
-                return False
+        if not self._ensure_token():
+            return False
         
         url = f"{self.GRAPH_API_ENDPOINT}/me/mailFolders/inbox/messageRules"
         
@@ -351,9 +720,8 @@ class OutlookConnector:
         Returns:
             True if successful
         """
-        if not self.access_token:
-            if not self.authenticate():
-                return False
+        if not self._ensure_token():
+            return False
         
         url = f"{self.GRAPH_API_ENDPOINT}/me/messages/{message_id}/move"
         data = {'destinationId': destination_folder_id}
@@ -372,9 +740,8 @@ class OutlookConnector:
         Returns:
             True if successful
         """
-        if not self.access_token:
-            if not self.authenticate():
-                return False
+        if not self._ensure_token():
+            return False
         
         url = f"{self.GRAPH_API_ENDPOINT}/me/messages/{message_id}"
         data = {'isRead': is_read}
@@ -393,9 +760,8 @@ class OutlookConnector:
         Returns:
             True if successful
         """
-        if not self.access_token:
-            if not self.authenticate():
-                return False
+        if not self._ensure_token():
+            return False
         
         # First get existing categories
         url = f"{self.GRAPH_API_ENDPOINT}/me/messages/{message_id}"
@@ -413,3 +779,116 @@ class OutlookConnector:
         response = self._make_request('PATCH', url, json_data=data)
         
         return response is not None
+    
+    def bulk_apply(self, operations: List[Dict[str, Any]]) -> List[bool]:
+        """Apply many message operations using Graph JSON batching.
+        
+        Each operation names one of the single-message methods and its
+        arguments, e.g. ``{'method': 'mark_as_read', 'message_id': id}``,
+        ``{'method': 'move_message', 'message_id': id,
+        'destination_folder_id': folder}`` or ``{'method': 'apply_category',
+        'message_id': id, 'category': name}``. Operations are sent up to
+        BATCH_REQUEST_LIMIT per request instead of one round trip each.
+        Graph runs the sub-requests of a batch in no particular order, so do
+        not combine a move with other operations on the same message.
+        
+        Args:
+            operations: Operation dictionaries as above
+        
+        Returns:
+            Whether each operation succeeded, in the same order
+        """
+        if not self._ensure_token():
+            return [False] * len(operations)
+        
+        # apply_category adds to the existing categories, so read them all first
+        categorized = list(dict.fromkeys(
+            op['message_id'] for op in operations if op['method'] == 'apply_category'
+        ))
+        current = self._send_batch([
+            {'id': str(i), 'method': 'GET', 'url': f"/me/messages/{message_id}?$select=categories"}
+            for i, message_id in enumerate(categorized)
+        ])
+        categories = {}
+        for i, message_id in enumerate(categorized):
+            response = current.get(str(i))
+            if response and response['status'] < 300:
+                categories[message_id] = response['body'].get('categories', [])
+        
+        sub_requests = []
+        request_ids = {}  # Operation index -> sub-request id
+        category_requests = {}  # Message id -> its single categories PATCH
+        for index, op in enumerate(operations):
+            message_id = op['message_id']
+            method = op['method']
+            if method == 'mark_as_read':
+                request = {'method': 'PATCH', 'url': f"/me/messages/{message_id}",
+                           'body': {'isRead': op.get('is_read', True)}}
+            elif method == 'move_message':
+                request = {'method': 'POST', 'url': f"/me/messages/{message_id}/move",
+                           'body': {'destinationId': op['destination_folder_id']}}
+            elif method == 'apply_category':
+                if message_id not in categories:
+                    continue
+                if op['category'] not in categories[message_id]:
+                    categories[message_id].append(op['category'])
+                if message_id in category_requests:
+                    request_ids[index] = category_requests[message_id]
+                    continue
+                category_requests[message_id] = str(index)
+                request = {'method': 'PATCH', 'url': f"/me/messages/{message_id}",
+                           'body': {'categories': categories[message_id]}}
+            else:
+                logger.error(f"Unsupported operation: {method}")
+                continue
+            
+            request['id'] = request_ids[index] = str(index)
+            request['headers'] = {'Content-Type': 'application/json'}
+            sub_requests.append(request)
+        
+        responses = self._send_batch(sub_requests)
+        return [
+            index in request_ids and responses.get(request_ids[index], {}).get('status', 500) < 300
+            for index in range(len(operations))
+        ]
+    
+    def _send_batch(self, sub_requests: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Send sub-requests through Graph JSON $batch, returning responses by id.
+        
+        Sub-requests that are throttled (429) or fail with a 5xx status are
+        resent, up to BATCH_RETRIES times, after the longest Retry-After any
+        of them asked for.
+        """
+        url = f"{self.GRAPH_API_ENDPOINT}/$batch"
+        responses = {}
+        pending = sub_requests
+        for attempt in range(BATCH_RETRIES + 1):
+            retry = []
+            wait = 0.0
+            for start in range(0, len(pending), BATCH_REQUEST_LIMIT):
+                chunk = pending[start:start + BATCH_REQUEST_LIMIT]
+                reply = self._make_request('POST', url, json_data={'requests': chunk})
+                if reply is None:
+                    continue
+                
+                by_id = {request['id']: request for request in chunk}
+                for response in reply.get('responses', []):
+                    status = response.get('status', 500)
+                    if (status == 429 or status >= 500) and attempt < BATCH_RETRIES:
+                        retry.append(by_id[response['id']])
+                        retry_after = response.get('headers', {}).get('Retry-After')
+                        try:
+                            delay = float(retry_after)
+                        except (TypeError, ValueError):
+                            delay = 2 ** attempt
+                        wait = max(wait, delay)
+                    else:
+                        responses[response['id']] = response
+            
+            if not retry:
+                break
+            logger.info(f"Retrying {len(retry)} throttled batch requests in {wait:.0f}s")
+            time.sleep(wait)
+            pending = retry
+        
+        return responses
@@ -5,14 +5,52 @@ sender patterns, content patterns, and behavioral patterns.
 """
 
 import logging
-from collections import defaultdict, Counter
-from datetime import datetime, timedelta
+from collections import Counter
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional, Tuple
 import numpy as np
+import pandas as pd
 import re
 
 logger = logging.getLogger(__name__)
 
+# Subject keywords: whole words of four or more lowercase letters
+_KEYWORD_RE = re.compile(r'\b[a-z]{4,}\b')
+# Common words never reported as subject keywords
+_STOP_WORDS = frozenset({'from', 'with', 'your', 'this', 'that', 'have', 'will', 'would', 'could'})
+
+
+def _absolute_dates(dates: List[datetime]) -> np.ndarray:
+    """Return dates as comparable datetime64[us] instants.
+    
+    Timezone-aware dates are converted to UTC; naive dates are taken as-is.
+    """
+    try:
+        return pd.to_datetime(dates, utc=True).tz_localize(None).to_numpy().astype('datetime64[us]')
+    except (OverflowError, pd.errors.OutOfBoundsDatetime):
+        # Nanosecond pandas versions cannot hold dates far from the present
+        return np.array([
+            d.astimezone(timezone.utc).replace(tzinfo=None) if d.tzinfo else d
+            for d in dates
+        ], dtype='datetime64[us]')
+
+
+def _date_columns(dates: List[datetime]) -> Tuple[np.ndarray, np.ndarray]:
+    """Return each date's comparable instant and its wall-clock time.
+    
+    Returns:
+        Tuple of datetime64[us] arrays: the instants from _absolute_dates()
+        and the local times, each date's wall-clock time in its own timezone
+    """
+    instants = _absolute_dates(dates)
+    
+    # An aware date's wall-clock time is its UTC instant plus its offset
+    offsets = np.fromiter(
+        (offset // timedelta(microseconds=1) if (offset := d.utcoffset()) else 0 for d in dates),
+        dtype=np.int64, count=len(dates)
+    )
+    return instants, instants + offsets.astype('timedelta64[us]')
+
 
 class PatternDetector:
     """Detects patterns in email data.
@@ -36,11 +74,15 @@ class PatternDetector:
         
         logger.info("PatternDetector initialized")
     
-    def detect_patterns(self, emails: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def detect_patterns(self, emails: List[Dict[str, Any]],
+                        frame: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Detect all patterns in email data.
         
         Args:
             emails: List of normalized email dictionaries
+            frame: Optional column view of the emails, as already built by
+                EmailAnalyzer; see _email_columns() for the columns used.
+                Built from the emails when omitted
         
         Returns:
             Dictionary containing detected patterns
@@ -50,31 +92,61 @@ class PatternDetector:
         
         logger.info(f"Detecting patterns in {len(emails)} emails")
         
+        # The fields the passes group and count, extracted once as columns
+        if frame is None:
+            frame = self._email_columns(emails)
+        local = frame['local'].to_numpy()
+        
         patterns = {
-            'temporal': self._detect_temporal_patterns(emails),
-            'sender': self._detect_sender_patterns(emails),
+            'temporal': self._detect_temporal_patterns(emails, local),
+            'sender': self._detect_sender_patterns(emails, frame),
             'content': self._detect_content_patterns(emails),
-            'volume': self._detect_volume_patterns(emails),
-            'thread': self._detect_thread_patterns(emails),
+            'volume': self._detect_volume_patterns(emails, local),
+            'thread': self._detect_thread_patterns(emails, frame),
             'behavioral': self._detect_behavioral_patterns(emails)
         }
         
         logger.info("Pattern detection completed")
         return patterns
     
-    def _detect_temporal_patterns(self, emails: List[Dict[str, Any]]) -> Dict[str, Any]:
+    @staticmethod
+    def _email_columns(emails: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Collect the fields the pattern passes group and count as columns.
+        
+        Returns:
+            DataFrame with one row per email and the columns 'sender'
+            (categorical, categories in order of first appearance), 'instant'
+            (comparable datetime64[us]; aware dates converted to UTC), 'local'
+            (datetime64[us] wall-clock time in each email's own timezone) and
+            'thread_id', the same columns EmailAnalyzer's frame provides
+        """
+        codes, senders = pd.factorize(np.array([e['sender'] for e in emails], dtype=object))
+        instants, local = _date_columns([e['date'] for e in emails])
+        
+        return pd.DataFrame({
+            'sender': pd.Categorical.from_codes(codes, senders),
+            'instant': instants,
+            'local': local,
+            # object dtype keeps missing ids as None rather than NaN
+            'thread_id': pd.Series([e.get('thread_id') for e in emails], dtype=object)
+        })
+    
+    def _detect_temporal_patterns(self, emails: List[Dict[str, Any]],
+                                  local: Optional[np.ndarray] = None) -> Dict[str, Any]:
         """Detect time-based patterns."""
+        if local is None:
+            local = self._email_columns(emails)['local'].to_numpy()
         patterns = {}
         
         # Time of day patterns
-        hours = [e['date'].hour for e in emails]
-        hour_counts = Counter(hours)
+        hours = local.astype('datetime64[h]').astype(np.int64) % 24
+        hour_counts = np.bincount(hours, minlength=24)
         
         # Define time periods
-        morning = sum(hour_counts[h] for h in range(6, 12))
-        afternoon = sum(hour_counts[h] for h in range(12, 18))
-        evening = sum(hour_counts[h] for h in range(18, 24))
-        night = sum(hour_counts[h] for h in range(0, 6))
+        morning = int(hour_counts[6:12].sum())
+        afternoon = int(hour_counts[12:18].sum())
+        evening = int(hour_counts[18:24].sum())
+        night = int(hour_counts[0:6].sum())
         
         total = len(emails)
         patterns['time_of_day'] = {
@@ -84,10 +156,10 @@ class PatternDetector:
             'night': {'count': night, 'percentage': (night/total)*100}
         }
         
-        # Day of week patterns
-        weekdays = [e['date'].weekday() for e in emails]
-        workday_count = sum(1 for d in weekdays if d < 5)
-        weekend_count = sum(1 for d in weekdays if d >= 5)
+        # Day of week patterns (1970-01-01 was a Thursday, weekday 3)
+        weekdays = (local.astype('datetime64[D]').astype(np.int64) + 3) % 7
+        workday_count = int(np.count_nonzero(weekdays < 5))
+        weekend_count = total - workday_count
         
         patterns['workweek_vs_weekend'] = {
             'workdays': {'count': workday_count, 'percentage': (workday_count/total)*100},
@@ -95,36 +167,46 @@ class PatternDetector:
         }
         
         # Detect if there's a consistent daily pattern
-        patterns['has_daily_routine'] = self._detect_daily_routine(hours)
+        patterns['has_daily_routine'] = self._detect_daily_routine(hour_counts)
         
         # Monthly seasonality
-        patterns['monthly_seasonality'] = self._detect_monthly_seasonality(emails)
+        patterns['monthly_seasonality'] = self._detect_monthly_seasonality(emails, local)
         
         return patterns
     
-    def _detect_daily_routine(self, hours: List[int]) -> bool:
-        """Detect if there's a consistent daily email routine."""
-        hour_counts = Counter(hours)
+    def _detect_daily_routine(self, hour_counts: np.ndarray) -> bool:
+        """Detect if there's a consistent daily email routine.
+        
+        Args:
+            hour_counts: Number of emails per hour of the day (length 24)
+        """
+        total = int(hour_counts.sum())
         
         # Check if 80% of emails fall within a 4-hour window
-        sorted_hours = sorted(hour_counts.items(), key=lambda x: x[1], reverse=True)
-        top_hours = sorted_hours[:4]
-        top_count = sum(count for _, count in top_hours)
+        top_count = int(np.sort(hour_counts)[-4:].sum())
         
-        return (top_count / len(hours)) > 0.8 if hours else False
+        return (top_count / total) > 0.8 if total else False
     
-    def _detect_monthly_seasonality(self, emails: List[Dict[str, Any]]) -> Dict[str, Any]:
+    @staticmethod
+    def _first_seen_counts(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Count distinct values, listed in order of first appearance."""
+        unique, first, counts = np.unique(values, return_index=True, return_counts=True)
+        order = np.argsort(first, kind='stable')
+        return unique[order], counts[order]
+    
+    def _detect_monthly_seasonality(self, emails: List[Dict[str, Any]],
+                                    local: Optional[np.ndarray] = None) -> Dict[str, Any]:
         """Detect monthly patterns and seasonality."""
-        monthly_counts = defaultdict(int)
-        
-        for email in emails:
-            month = email['date'].month
-            monthly_counts[month] += 1
+        if local is None:
+            local = self._email_columns(emails)['local'].to_numpy()
+        months, month_counts = self._first_seen_counts(
+            local.astype('datetime64[M]').astype(np.int64) % 12 + 1
+        )
         
-        if len(monthly_counts) < 3:
+        if len(months) < 3:
             return {'detected': False}
         
-        counts = list(monthly_counts.values())
+        counts = month_counts.tolist()
         avg = np.mean(counts)
         std = np.std(counts)
         
@@ -134,103 +216,91 @@ class PatternDetector:
         month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
                       'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
         
+        # argmax picks the first of equally busy months, like max() did
         return {
             'detected': has_seasonality,
-            'monthly_distribution': {month_names[m-1]: c for m, c in monthly_counts.items()},
-            'peak_month': month_names[max(monthly_counts.items(), key=lambda x: x[1])[0] - 1] if monthly_counts else None
+            'monthly_distribution': {month_names[m-1]: c for m, c in zip(months.tolist(), counts)},
+            'peak_month': month_names[int(months[month_counts.argmax()]) - 1]
         }
     
-    def _detect_sender_patterns(self, emails: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _detect_sender_patterns(self, emails: List[Dict[str, Any]],
+                                frame: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Detect patterns in sender behavior."""
-        sender_emails = defaultdict(list)
-        
-        for email in emails:
-            sender_emails[email['sender']].append(email)
+        if frame is None:
+            frame = self._email_columns(emails)
+        senders = frame['sender'].cat.categories.tolist()
+        codes = frame['sender'].cat.codes.to_numpy()
+        instants = frame['instant'].to_numpy()
+        sender_counts = np.bincount(codes, minlength=len(senders))
+        
+        # Sort by (sender, date) once, so each sender's emails are adjacent
+        # and in date order; the gaps are the diffs between neighbouring rows
+        order = np.lexsort((instants, codes))
+        codes, instants = codes[order], instants[order]
+        ends = np.cumsum(sender_counts)
+        span_days = (instants[ends - 1] - instants[ends - sender_counts]) // np.timedelta64(1, 'D')
+        same_sender = codes[1:] == codes[:-1]
+        gaps = np.diff(instants)[same_sender]
+        
+        # The gaps are grouped by sender too (CSR layout): each sender with
+        # at least two emails owns one contiguous run, summed with reduceat
+        gap_counts = sender_counts - 1
+        has_gaps = np.flatnonzero(gap_counts > 0)
+        starts = (np.cumsum(gap_counts) - gap_counts)[has_gaps]
+        counts = gap_counts[has_gaps]
+        
+        # Burst if many emails sent within short intervals (within 24 hours)
+        burst_scores = np.zeros(len(senders))
+        burst_scores[has_gaps] = np.add.reduceat(
+            (gaps < np.timedelta64(24, 'h')).astype(np.int64), starts) / counts
+        
+        # Whole days between consecutive emails, as timedelta.days gives
+        days = gaps // np.timedelta64(1, 'D')
+        avg_interval = np.add.reduceat(days, starts) / counts
+        deviations = days - np.repeat(avg_interval, counts)
+        std_interval = np.sqrt(np.add.reduceat(deviations * deviations, starts) / counts)
+        
+        # High regularity if intervals have low standard deviation; senders
+        # with fewer than three emails or all-same-day gaps score zero
+        scored = (counts >= 2) & (avg_interval != 0)
+        regularity = np.zeros(len(senders))
+        regularity[has_gaps[scored]] = 1.0 / (1.0 + std_interval[scored] / avg_interval[scored])
+        
+        # Codes follow first appearance, so senders keep their original order
+        qualifying = sender_counts >= self.min_occurrences
+        frequent = qualifying & (sender_counts > self.pattern_thresholds.get('frequent_sender', 20))
+        bursty = qualifying & (burst_scores > 0.7)
+        regular = qualifying & (regularity > 0.7)
         
-        patterns = {
-            'frequent_senders': [],
-            'burst_senders': [],
-            'regular_senders': []
+        return {
+            'frequent_senders': [
+                {
+                    'sender': senders[code],
+                    'count': int(sender_counts[code]),
+                    'emails_per_month': int(sender_counts[code]) / max(1, int(span_days[code]) / 30)
+                }
+                for code in np.flatnonzero(frequent).tolist()
+            ],
+            'burst_senders': [
+                {'sender': senders[code], 'burst_score': float(burst_scores[code])}
+                for code in np.flatnonzero(bursty).tolist()
+            ],
+            'regular_senders': [
+                {'sender': senders[code], 'regularity_score': float(regularity[code])}
+                for code in np.flatnonzero(regular).tolist()
+            ]
         }
-        
-        for sender, sender_mails in sender_emails.items():
-            if len(sender_mails) < self.min_occurrences:
-                continue
-            
-            # Frequent senders (high volume)
-            if len(sender_mails) > self.pattern_thresholds.get('frequent_sender', 20):
-                patterns['frequent_senders'].append({
-                    'sender': sender,
-                    'count': len(sender_mails),
-                    'emails_per_month': len(sender_mails) / max(1, 
-                        (max(e['date'] for e in sender_mails) - 
-                         min(e['date'] for e in sender_mails)).days / 30)
-                })
-            
-            # Check for burst patterns (many emails in short time)
-            burst_score = self._calculate_burst_score(sender_mails)
-            if burst_score > 0.7:
-                patterns['burst_senders'].append({
-                    'sender': sender,
-                    'burst_score': burst_score
-                })
-            
-            # Regular senders (consistent frequency)
-            regularity = self._calculate_regularity(sender_mails)
-            if regularity > 0.7:
-                patterns['regular_senders'].append({
-                    'sender': sender,
-                    'regularity_score': regularity
-                })
-        
-        return patterns
-    
-    def _calculate_burst_score(self, emails: List[Dict[str, Any]]) -> float:
-        """Calculate burst score for a sender."""
-        if len(emails) < 2:
-            return 0.0
-        
-        dates = sorted([e['date'] for e in emails])
-        intervals = [(dates[i+1] - dates[i]).total_seconds() / 3600 
-                    for i in range(len(dates)-1)]
-        
-        # Burst if many emails sent within short intervals
-        short_intervals = sum(1 for i in intervals if i < 24)  # Within 24 hours
-        return short_intervals / len(intervals) if intervals else 0.0
-    
-    def _calculate_regularity(self, emails: List[Dict[str, Any]]) -> float:
-        """Calculate regularity score for a sender."""
-        if len(emails) < 3:
-            return 0.0
-        
-        dates = sorted([e['date'] for e in emails])
-        intervals = [(dates[i+1] - dates[i]).days 
-                    for i in range(len(dates)-1)]
-        
-        if not intervals:
-            return 0.0
-        
-        # High regularity if intervals have low standard deviation
-        avg_interval = np.mean(intervals)
-        std_interval = np.std(intervals)
-        
-        if avg_interval == 0:
-            return 0.0
-        
-        regularity = 1.0 / (1.0 + (std_interval / avg_interval))
-        return regularity
     
     def _detect_content_patterns(self, emails: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Detect patterns in email content."""
-        # Extract common keywords from subjects
-        all_subjects = ' '.join([e['subject'].lower() for e in emails])
-        words = re.findall(r'\b[a-z]{4,}\b', all_subjects)
-        word_counts = Counter(words)
+        # Extract common keywords from subjects, one subject at a time so
+        # neither a joined copy of all subjects nor a list of every match is built
+        findall = _KEYWORD_RE.findall
+        word_counts = Counter(w for e in emails for w in findall(e['subject'].lower()))
         
         # Remove common stop words
-        stop_words = {'from', 'with', 'your', 'this', 'that', 'have', 'will', 'would', 'could'}
         filtered_words = {w: c for w, c in word_counts.items() 
-                         if w not in stop_words and c >= self.min_occurrences}
+                         if w not in _STOP_WORDS and c >= self.min_occurrences}
         
         # Detect recurring subject patterns
         subject_patterns = self._detect_subject_patterns(emails)
@@ -249,15 +319,10 @@ class PatternDetector:
         """Detect recurring patterns in subject lines."""
         subjects = [e['subject'] for e in emails]
         
-        # Look for subjects with similar prefixes
-        prefix_counts = defaultdict(int)
-        
-        for subject in subjects:
-            # Extract prefix (first few words)
-            words = subject.split()[:3]
-            if words:
-                prefix = ' '.join(words).lower()
-                prefix_counts[prefix] += 1
+        # Look for subjects with similar prefixes (first three words); the
+        # split stops after the third word, and blank subjects give no prefix
+        prefix_counts = Counter([' '.join(subject.split(None, 3)[:3]).lower() for subject in subjects])
+        prefix_counts.pop('', None)
         
         patterns = []
         for prefix, count in prefix_counts.items():
@@ -270,42 +335,43 @@ class PatternDetector:
         
         return sorted(patterns, key=lambda x: x['occurrences'], reverse=True)[:10]
     
-    def _detect_volume_patterns(self, emails: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _detect_volume_patterns(self, emails: List[Dict[str, Any]],
+                                local: Optional[np.ndarray] = None) -> Dict[str, Any]:
         """Detect volume trends and anomalies."""
         if not emails:
             return {}
+        if local is None:
+            local = self._email_columns(emails)['local'].to_numpy()
         
-        # Group emails by day
-        daily_counts = defaultdict(int)
-        for email in emails:
-            date_key = email['date'].date()
-            daily_counts[date_key] += 1
-        
-        counts = list(daily_counts.values())
-        
-        if not counts:
-            return {}
+        # Group emails by day, keeping days in order of first appearance
+        days, day_counts = self._first_seen_counts(local.astype('datetime64[D]'))
+        counts = day_counts.tolist()
         
         avg_daily = np.mean(counts)
         std_daily = np.std(counts)
         
-        # Detect anomalies (days with unusually high/low volume)
+        # Detect anomalies (days with unusually high/low volume), keeping the
+        # ten largest deviations; the stable sort breaks ties by first
+        # appearance, and only those ten become dictionaries
         anomalies = []
-        for date, count in daily_counts.items():
-            z_score = (count - avg_daily) / std_daily if std_daily > 0 else 0
-            if abs(z_score) > 2:  # More than 2 standard deviations
+        if std_daily > 0:
+            z_scores = (day_counts - avg_daily) / std_daily
+            deviations = np.abs(z_scores)
+            flagged = np.flatnonzero(deviations > 2)  # More than 2 standard deviations
+            for i in flagged[np.argsort(-deviations[flagged], kind='stable')[:10]].tolist():
+                z_score = z_scores[i]
                 anomalies.append({
-                    'date': date.isoformat(),
-                    'count': count,
+                    'date': days[i].item().isoformat(),
+                    'count': counts[i],
                     'deviation': z_score,
                     'type': 'spike' if z_score > 0 else 'drop'
                 })
         
         # Detect trend (increasing/decreasing)
-        sorted_dates = sorted(daily_counts.keys())
-        if len(sorted_dates) > 7:
-            recent_avg = np.mean([daily_counts[d] for d in sorted_dates[-7:]])
-            older_avg = np.mean([daily_counts[d] for d in sorted_dates[:7]])
+        if len(days) > 7:
+            sorted_counts = day_counts[np.argsort(days)]
+            recent_avg = np.mean(sorted_counts[-7:])
+            older_avg = np.mean(sorted_counts[:7])
             trend = 'increasing' if recent_avg > older_avg * 1.2 else \
                    ('decreasing' if recent_avg < older_avg * 0.8 else 'stable')
         else:
@@ -315,32 +381,30 @@ class PatternDetector:
             'average_daily': float(avg_daily),
             'std_deviation': float(std_daily),
             'trend': trend,
-            'anomalies': sorted(anomalies, key=lambda x: abs(x['deviation']), reverse=True)[:10]
+            'anomalies': anomalies
         }
     
-    def _detect_thread_patterns(self, emails: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _detect_thread_patterns(self, emails: List[Dict[str, Any]],
+                                frame: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Detect patterns in email threads."""
-        threads = defaultdict(list)
+        if frame is None:
+            frame = self._email_columns(emails)
+        thread_ids = frame['thread_id'].to_numpy()
         
-        for email in emails:
-            thread_id = email.get('thread_id')
-            if thread_id:
-                threads[thread_id].append(email)
-        
-        if not threads:
+        # Only the number of emails per thread is needed; empty ids are skipped
+        thread_ids = thread_ids[thread_ids.astype(bool)]
+        if not len(thread_ids):
             return {'thread_analysis_available': False}
         
-        thread_lengths = [len(emails) for emails in threads.values()]
-        
-        long_threads = [tid for tid, emails in threads.items() if len(emails) > 10]
+        thread_lengths = np.fromiter(Counter(thread_ids.tolist()).values(), dtype=np.int64)
         
         return {
             'thread_analysis_available': True,
-            'total_threads': len(threads),
+            'total_threads': len(thread_lengths),
             'average_thread_length': float(np.mean(thread_lengths)),
-            'max_thread_length': max(thread_lengths),
-            'long_threads_count': len(long_threads),
-            'emails_in_threads_percentage': (sum(thread_lengths) / len(emails)) * 100 if emails else 0
+            'max_thread_length': int(thread_lengths.max()),
+            'long_threads_count': int(np.count_nonzero(thread_lengths > 10)),
+            'emails_in_threads_percentage': (len(thread_ids) / len(emails)) * 100
         }
     
     def _detect_behavioral_patterns(self, emails: List[Dict[str, Any]]) -> Dict[str, Any]:
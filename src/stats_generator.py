@@ -4,21 +4,258 @@ Generates comprehensive statistics and reports for email analysis,
 including daily, weekly, monthly reports with visualizations.
 """
 
+import hashlib
 import logging
 import json
 import csv
+import os
+import shutil
+from html import escape
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from collections import defaultdict, Counter
-import pandas as pd
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Directory under the report output directory holding the cached report bundle
+REPORT_CACHE_DIR = '.cache'
+
+# File inside a cached bundle listing the reports it contains
+REPORT_MANIFEST_FILE = 'manifest.json'
+
+# File in the report output directory recording the data each chart was drawn from
+CHART_HASHES_FILE = '.chart_hashes.json'
+
+# HTML report page up to the top senders rows
+_HTML_REPORT_HEAD = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Email Analysis Report</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 40px; background-color: #f5f5f5; }}
+        .container {{ max-width: 1200px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
+        h1 {{ color: #333; border-bottom: 3px solid #4CAF50; padding-bottom: 10px; }}
+        h2 {{ color: #666; margin-top: 30px; }}
+        .stat-box {{ display: inline-block; background: #e8f5e9; padding: 20px; margin: 10px; border-radius: 5px; min-width: 200px; }}
+        .stat-label {{ font-weight: bold; color: #4CAF50; }}
+        .stat-value {{ font-size: 24px; color: #333; margin-top: 5px; }}
+        table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
+        th {{ background-color: #4CAF50; color: white; padding: 12px; text-align: left; }}
+        td {{ padding: 10px; border-bottom: 1px solid #ddd; }}
+        tr:hover {{ background-color: #f5f5f5; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>📧 Email Analysis Report</h1>
+        <p>Generated on: {generated_on}</p>
+        
+        <h2>Summary Statistics</h2>
+        <div class="stat-box">
+            <div class="stat-label">Total Emails</div>
+            <div class="stat-value">{total_emails:,}</div>
+        </div>
+        <div class="stat-box">
+            <div class="stat-label">Emails per Day</div>
+            <div class="stat-value">{emails_per_day:.1f}</div>
+        </div>
+        <div class="stat-box">
+            <div class="stat-label">Unique Senders</div>
+            <div class="stat-value">{unique_senders:,}</div>
+        </div>
+        <div class="stat-box">
+            <div class="stat-label">Top Category</div>
+            <div class="stat-value">{dominant_category}</div>
+        </div>
+        
+        <h2>Top Senders</h2>
+        <table>
+            <thead>
+                <tr>
+                    <th>Sender</th>
+                    <th>Count</th>
+                    <th>Percentage</th>
+                </tr>
+            </thead>
+            <tbody>
+"""
+
+# One row of the top senders table
+_HTML_SENDER_ROW = """
+                <tr>
+                    <td>{email}</td>
+                    <td>{count:,}</td>
+                    <td>{percentage:.1f}%</td>
+                </tr>
+"""
+
+# Closes the top senders table and the page
+_HTML_REPORT_TAIL = """
+            </tbody>
+        </table>
+    </div>
+</body>
+</html>
+"""
+
+
+def _plotting():
+    """Import pyplot and seaborn on first use and apply the chart style.
+    
+    Together they take most of a second to import, so they are only
+    loaded once a chart is actually drawn.
+    """
+    import matplotlib
+    matplotlib.use('Agg')  # Use non-interactive backend
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
+    # Set style for charts
+    sns.set_style('whitegrid')
+    return plt, sns
+
+
+def _content_hash(value: Any) -> str:
+    """Hash a JSON-serializable value independently of dict ordering."""
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(value, default=_json_default,
+                               option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS)
+    else:
+        payload = json.dumps(value, sort_keys=True, default=str).encode('utf-8')
+    
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize values orjson can't, the way ``json.dump(default=str)`` would.
+
+    The stdlib encoder writes float subclasses such as ``numpy.float64``
+    as numbers, while orjson hands them to ``default``.
+    """
+    if isinstance(obj, float):
+        return float(obj)
+    return str(obj)
+
+
+# The chart renderers are module-level and take only the data they draw, so
+# they can run in a worker process without pickling the generator or results
+def _generate_hourly_chart(hourly_dist: Dict[int, int], file_path: Path, dpi: int) -> Optional[str]:
+    """Generate hourly distribution bar chart."""
+    try:
+        if not hourly_dist:
+            return None
+        
+        plt, _ = _plotting()
+        plt.figure(figsize=(12, 6))
+        hours = sorted(hourly_dist.keys())
+        counts = [hourly_dist[h] for h in hours]
+        
+        plt.bar(hours, counts, color='#4CAF50', alpha=0.7)
+        plt.xlabel('Hour of Day')
+        plt.ylabel('Number of Emails')
+        plt.title('Email Distribution by Hour of Day')
+        plt.xticks(range(0, 24))
+        plt.grid(axis='y', alpha=0.3)
+        
+        plt.savefig(file_path, bbox_inches='tight', dpi=dpi)
+        plt.close()
+        
+        logger.info(f"Generated hourly chart: {file_path}")
+        return str(file_path)
+    except Exception as e:
+        logger.error(f"Error generating hourly chart: {e}")
+        return None
+
+
+def _generate_category_chart(categories: Dict[str, Dict[str, Any]], file_path: Path, dpi: int) -> Optional[str]:
+    """Generate category distribution pie chart."""
+    try:
+        if not categories:
+            return None
+        
+        plt, sns = _plotting()
+        plt.figure(figsize=(10, 8))
+        labels = [cat.title() for cat in categories.keys()]
+        sizes = [info['count'] for info in categories.values()]
+        colors = sns.color_palette('Set3', len(labels))
+        
+        plt.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
+        plt.title('Email Distribution by Category')
+        plt.axis('equal')
+        
+        plt.savefig(file_path, bbox_inches='tight', dpi=dpi)
+        plt.close()
+        
+        logger.info(f"Generated category chart: {file_path}")
+        return str(file_path)
+    except Exception as e:
+        logger.error(f"Error generating category chart: {e}")
+        return None
+
+
+def _generate_sender_chart(top_senders: List[Dict[str, Any]], file_path: Path, dpi: int) -> Optional[str]:
+    """Generate top senders horizontal bar chart."""
+    try:
+        if not top_senders:
+            return None
+        
+        plt, _ = _plotting()
+        plt.figure(figsize=(12, 8))
+        senders = [s['email'][:30] for s in top_senders]
+        counts = [s['count'] for s in top_senders]
+        
+        plt.barh(senders, counts, color='#2196F3', alpha=0.7)
+        plt.xlabel('Number of Emails')
+        plt.ylabel('Sender')
+        plt.title('Top 10 Email Senders')
+        plt.gca().invert_yaxis()
+        
+        plt.savefig(file_path, bbox_inches='tight', dpi=dpi)
+        plt.close()
+        
+        logger.info(f"Generated sender chart: {file_path}")
+        return str(file_path)
+    except Exception as e:
+        logger.error(f"Error generating sender chart: {e}")
+        return None
+
+
+def _generate_monthly_chart(monthly_trends: Dict[str, int], file_path: Path, dpi: int) -> Optional[str]:
+    """Generate monthly trend line chart."""
+    try:
+        if not monthly_trends:
+            return None
+        
+        plt, _ = _plotting()
+        plt.figure(figsize=(14, 6))
+        months = sorted(monthly_trends.keys())
+        counts = [monthly_trends[m] for m in months]
+        
+        plt.plot(months, counts, marker='o', linewidth=2, markersize=8, color='#FF9800')
+        plt.xlabel('Month')
+        plt.ylabel('Number of Emails')
+        plt.title('Email Volume Trend by Month')
+        plt.xticks(rotation=45, ha='right')
+        plt.grid(True, alpha=0.3)
+        
+        plt.savefig(file_path, bbox_inches='tight', dpi=dpi)
+        plt.close()
+        
+        logger.info(f"Generated monthly chart: {file_path}")
+        return str(file_path)
+    except Exception as e:
+        logger.error(f"Error generating monthly chart: {e}")
+        return None
+
 
 class StatsGenerator:
     """Generates statistics and reports from email analysis.
@@ -42,9 +279,10 @@ class StatsGenerator:
         self.export_formats = stats_config.get('export_formats', ['json', 'csv'])
         self.generate_charts = stats_config.get('generate_charts', True)
         self.chart_format = stats_config.get('chart_format', 'png')
-        
-        # Set style for charts
-        sns.set_style('whitegrid')
+        self.chart_dpi = stats_config.get('chart_dpi', 150)
+        self.parallel_charts = stats_config.get('parallel_charts', False)
+        self.num_workers = self.config.get('performance', {}).get('num_workers', 4)
+        self.report_cache = stats_config.get('report_cache', False)
         
         logger.info("StatsGenerator initialized")
     
@@ -62,6 +300,16 @@ class StatsGenerator:
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
+        # Reports depend only on the analysis results and the settings, so an
+        # unchanged analysis is served by copying back the cached bundle
+        cache_dir = None
+        if self.report_cache:
+            cache_dir = output_path / REPORT_CACHE_DIR / self._report_cache_key(analysis_results)
+            generated_files = self._restore_cached_reports(cache_dir, output_path)
+            if generated_files is not None:
+                logger.info(f"Restored cached reports in {output_dir}")
+                return generated_files
+        
         generated_files = {}
         
         # Generate statistics
@@ -89,9 +337,65 @@ class StatsGenerator:
             chart_files = self._generate_all_charts(analysis_results, output_path)
             generated_files['charts'] = chart_files
         
+        if cache_dir is not None:
+            self._cache_reports(generated_files, output_path, cache_dir)
+        
         logger.info(f"Generated reports in {output_dir}")
         return generated_files
     
+    def _report_cache_key(self, analysis_results: Dict[str, Any]) -> str:
+        """Hash the analysis results and the settings that shape the reports."""
+        # The timestamp changes on every analysis but never reaches a report
+        results = {key: value for key, value in analysis_results.items()
+                   if key != 'analysis_timestamp'}
+        settings = [self.export_formats, self.generate_charts, self.chart_format, self.chart_dpi]
+        return _content_hash([settings, results])
+    
+    def _restore_cached_reports(self, cache_dir: Path, output_path: Path) -> Optional[Dict[str, Any]]:
+        """Copy a cached report bundle into the output directory.
+        
+        Returns:
+            Dictionary with paths to the restored reports, or None when
+            there is no usable bundle
+        """
+        try:
+            with open(cache_dir / REPORT_MANIFEST_FILE, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            
+            generated_files = {}
+            for format_type, names in manifest.items():
+                paths = []
+                for name in (names if isinstance(names, list) else [names]):
+                    shutil.copy2(cache_dir / name, output_path / name)
+                    paths.append(str(output_path / name))
+                generated_files[format_type] = paths if isinstance(names, list) else paths[0]
+            return generated_files
+        except (OSError, ValueError):
+            return None
+    
+    def _cache_reports(self, generated_files: Dict[str, Any], output_path: Path, cache_dir: Path):
+        """Snapshot generated reports as the output directory's cached bundle."""
+        manifest = {
+            format_type: [Path(p).name for p in paths] if isinstance(paths, list) else Path(paths).name
+            for format_type, paths in generated_files.items()
+        }
+        
+        # Only the latest bundle is kept; it is built beside the cache and
+        # renamed into place so a partial bundle is never restored
+        tmp_dir = cache_dir.with_name(cache_dir.name + '.tmp')
+        try:
+            shutil.rmtree(cache_dir.parent, ignore_errors=True)
+            tmp_dir.mkdir(parents=True)
+            for names in manifest.values():
+                for name in (names if isinstance(names, list) else [names]):
+                    shutil.copy2(output_path / name, tmp_dir / name)
+            with open(tmp_dir / REPORT_MANIFEST_FILE, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+            os.replace(tmp_dir, cache_dir)
+        except OSError as e:
+            logger.warning(f"Could not cache reports: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    
     def generate_statistics(self, analysis_results: Dict[str, Any]) -> Dict[str, Any]:
         """Generate comprehensive statistics."""
         stats = {
@@ -160,9 +464,18 @@ class StatsGenerator:
         monthly_trends = temporal.get('monthly_trends', {})
         
         if monthly_trends:
-            avg_monthly = sum(monthly_trends.values()) / len(monthly_trends)
-            peak_month = max(monthly_trends.items(), key=lambda x: x[1])
-            low_month = min(monthly_trends.items(), key=lambda x: x[1])
+            # One pass for the total and both extremes; strict comparisons keep
+            # the first month on ties, as max()/min() do
+            total = 0
+            peak_month = low_month = None
+            for month_count in monthly_trends.items():
+                count = month_count[1]
+                total += count
+                if peak_month is None or count > peak_month[1]:
+                    peak_month = month_count
+                if low_month is None or count < low_month[1]:
+                    low_month = month_count
+            avg_monthly = total / len(monthly_trends)
         else:
             avg_monthly = 0
             peak_month = ('N/A', 0)
@@ -223,8 +536,13 @@ class StatsGenerator:
     
     def _export_json(self, stats: Dict[str, Any], file_path: Path):
         """Export statistics as JSON."""
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(stats, f, indent=2, default=str)
+        if ORJSON_AVAILABLE:
+            file_path.write_bytes(orjson.dumps(
+                stats, default=_json_default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(stats, f, indent=2, default=str)
         logger.info(f"Exported JSON to {file_path}")
     
     def _export_csv(self, stats: Dict[str, Any], file_path: Path):
@@ -262,218 +580,94 @@ class StatsGenerator:
         """Generate HTML report content."""
         summary = stats.get('summary', {})
         
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Email Analysis Report</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; background-color: #f5f5f5; }}
-        .container {{ max-width: 1200px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-        h1 {{ color: #333; border-bottom: 3px solid #4CAF50; padding-bottom: 10px; }}
-        h2 {{ color: #666; margin-top: 30px; }}
-        .stat-box {{ display: inline-block; background: #e8f5e9; padding: 20px; margin: 10px; border-radius: 5px; min-width: 200px; }}
-        .stat-label {{ font-weight: bold; color: #4CAF50; }}
-        .stat-value {{ font-size: 24px; color: #333; margin-top: 5px; }}
-        table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
-        th {{ background-color: #4CAF50; color: white; padding: 12px; text-align: left; }}
-        td {{ padding: 10px; border-bottom: 1px solid #ddd; }}
-        tr:hover {{ background-color: #f5f5f5; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>📧 Email Analysis Report</h1>
-        <p>Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        
-        <h2>Summary Statistics</h2>
-        <div class="stat-box">
-            <div class="stat-label">Total Emails</div>
-            <div class="stat-value">{summary.get('total_emails', 0):,}</div>
-        </div>
-        <div class="stat-box">
-            <div class="stat-label">Emails per Day</div>
-            <div class="stat-value">{summary.get('emails_per_day', 0):.1f}</div>
-        </div>
-        <div class="stat-box">
-            <div class="stat-label">Unique Senders</div>
-            <div class="stat-value">{summary.get('unique_senders', 0):,}</div>
-        </div>
-        <div class="stat-box">
-            <div class="stat-label">Top Category</div>
-            <div class="stat-value">{summary.get('dominant_category', 'N/A').title()}</div>
-        </div>
-        
-        <h2>Top Senders</h2>
-        <table>
-            <thead>
-                <tr>
-                    <th>Sender</th>
-                    <th>Count</th>
-                    <th>Percentage</th>
-                </tr>
-            </thead>
-            <tbody>
-"""
+        head = _HTML_REPORT_HEAD.format(
+            generated_on=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            total_emails=summary.get('total_emails', 0),
+            emails_per_day=summary.get('emails_per_day', 0),
+            unique_senders=summary.get('unique_senders', 0),
+            dominant_category=escape(summary.get('dominant_category', 'N/A').title())
+        )
         
         # Add top senders
-        for sender in stats.get('sender_stats', {}).get('top_10_senders', [])[:10]:
-            html += f"""
-                <tr>
-                    <td>{sender.get('email', '')}</td>
-                    <td>{sender.get('count', 0):,}</td>
-                    <td>{sender.get('percentage', 0):.1f}%</td>
-                </tr>
-"""
-        
-        html += """
-            </tbody>
-        </table>
-    </div>
-</body>
-</html>
-"""
-        
-        return html
+        rows = [
+            _HTML_SENDER_ROW.format(
+                email=escape(sender.get('email', '')),
+                count=sender.get('count', 0),
+                percentage=sender.get('percentage', 0)
+            )
+            for sender in stats.get('sender_stats', {}).get('top_10_senders', [])[:10]
+        ]
+        
+        return ''.join([head, *rows, _HTML_REPORT_TAIL])
     
     def _generate_all_charts(self, results: Dict[str, Any], output_dir: Path) -> List[str]:
         """Generate all visualization charts."""
-        chart_files = []
-        
-        # Hourly distribution chart
-        chart_file = self._generate_hourly_chart(results, output_dir)
-        if chart_file:
-            chart_files.append(chart_file)
-        
-        # Category distribution chart
-        chart_file = self._generate_category_chart(results, output_dir)
-        if chart_file:
-            chart_files.append(chart_file)
-        
-        # Top senders chart
-        chart_file = self._generate_sender_chart(results, output_dir)
-        if chart_file:
-            chart_files.append(chart_file)
+        temporal = results.get('temporal_patterns', {})
+        # Each chart with the file name it is saved under and the data it draws
+        charts = [
+            ('hourly_distribution', _generate_hourly_chart,
+             temporal.get('hourly_distribution', {})),
+            ('category_distribution', _generate_category_chart,
+             results.get('categories', {}).get('distribution', {})),
+            ('top_senders', _generate_sender_chart,
+             results.get('sender_stats', {}).get('top_senders', [])[:10]),
+            ('monthly_trend', _generate_monthly_chart,
+             temporal.get('monthly_trends', {}))
+        ]
+        
+        # With the report cache on, a chart whose data and settings match the
+        # previous run keeps its existing image instead of being re-rendered
+        chart_files = {}
+        chart_hashes = {}
+        if self.report_cache:
+            previous_hashes = self._load_chart_hashes(output_dir)
+            for name, _, data in charts:
+                chart_hashes[name] = _content_hash([self.chart_format, self.chart_dpi, data])
+                file_path = output_dir / f'{name}.{self.chart_format}'
+                if previous_hashes.get(name) == chart_hashes[name] and file_path.exists():
+                    logger.info(f"Reusing unchanged chart: {file_path}")
+                    chart_files[name] = str(file_path)
+        
+        pending = [(generate, data, output_dir / f'{name}.{self.chart_format}', name)
+                   for name, generate, data in charts if name not in chart_files]
+        
+        # The charts are independent and almost all of their time goes to
+        # rasterizing and compressing, so on multi-core machines each can be
+        # rendered in its own process; only its own slice of data is sent
+        if self.parallel_charts and len(pending) > 1:
+            workers = min(self.num_workers, len(pending))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {name: executor.submit(generate, data, file_path, self.chart_dpi)
+                           for generate, data, file_path, name in pending}
+                for name, future in futures.items():
+                    chart_files[name] = future.result()
+        else:
+            for generate, data, file_path, name in pending:
+                chart_files[name] = generate(data, file_path, self.chart_dpi)
         
-        # Monthly trend chart
-        chart_file = self._generate_monthly_chart(results, output_dir)
-        if chart_file:
-            chart_files.append(chart_file)
+        if self.report_cache:
+            self._save_chart_hashes(output_dir, {
+                name: chart_hash for name, chart_hash in chart_hashes.items()
+                if chart_files.get(name)
+            })
         
-        return chart_files
-    
-    def _generate_hourly_chart(self, results: Dict[str, Any], output_dir: Path) -> Optional[str]:
-        """Generate hourly distribution bar chart."""
-        try:
-            temporal = results.get('temporal_patterns', {})
-            hourly_dist = temporal.get('hourly_distribution', {})
-            
-            if not hourly_dist:
-                return None
-            
-            plt.figure(figsize=(12, 6))
-            hours = sorted(hourly_dist.keys())
-            counts = [hourly_dist[h] for h in hours]
-            
-            plt.bar(hours, counts, color='#4CAF50', alpha=0.7)
-            plt.xlabel('Hour of Day')
-            plt.ylabel('Number of Emails')
-            plt.title('Email Distribution by Hour of Day')
-            plt.xticks(range(0, 24))
-            plt.grid(axis='y', alpha=0.3)
-            
-            file_path = output_dir / f'hourly_distribution.{self.chart_format}'
-            plt.savefig(file_path, bbox_inches='tight', dpi=300)
-            plt.close()
-            
-            logger.info(f"Generated hourly chart: {file_path}")
-            return str(file_path)
-        except Exception as e:
-            logger.error(f"Error generating hourly chart: {e}")
-            return None
+        return [chart_files[name] for name, _, _ in charts if chart_files.get(name)]
     
-    def _generate_category_chart(self, results: Dict[str, Any], output_dir: Path) -> Optional[str]:
-        """Generate category distribution pie chart."""
+    def _load_chart_hashes(self, output_dir: Path) -> Dict[str, str]:
+        """Load the data hashes recorded for the charts in ``output_dir``."""
         try:
-            categories = results.get('categories', {}).get('distribution', {})
-            
-            if not categories:
-                return None
-            
-            plt.figure(figsize=(10, 8))
-            labels = [cat.title() for cat in categories.keys()]
-            sizes = [info['count'] for info in categories.values()]
-            colors = sns.color_palette('Set3', len(labels))
-            
-            plt.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
-            plt.title('Email Distribution by Category')
-            plt.axis('equal')
-            
-            file_path = output_dir / f'category_distribution.{self.chart_format}'
-            plt.savefig(file_path, bbox_inches='tight', dpi=300)
-            plt.close()
-            
-            logger.info(f"Generated category chart: {file_path}")
-            return str(file_path)
-        except Exception as e:
-            logger.error(f"Error generating category chart: {e}")
-            return None
+            with open(output_dir / CHART_HASHES_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
     
-    def _generate_sender_chart(self, results: Dict[str, Any], output_dir: Path) -> Optional[str]:
-        """Generate top senders horizontal bar chart."""
+    def _save_chart_hashes(self, output_dir: Path, chart_hashes: Dict[str, str]):
+        """Record the data hashes of the charts in ``output_dir``."""
+        hashes_file = output_dir / CHART_HASHES_FILE
+        tmp_file = hashes_file.with_name(hashes_file.name + '.tmp')
         try:
-            sender_stats = results.get('sender_stats', {})
-            top_senders = sender_stats.get('top_senders', [])[:10]
-            
-            if not top_senders:
-                return None
-            
-            plt.figure(figsize=(12, 8))
-            senders = [s['email'][:30] for s in top_senders]
-            counts = [s['count'] for s in top_senders]
-            
-            plt.barh(senders, counts, color='#2196F3', alpha=0.7)
-            plt.xlabel('Number of Emails')
-            plt.ylabel('Sender')
-            plt.title('Top 10 Email Senders')
-            plt.gca().invert_yaxis()
-            
-            file_path = output_dir / f'top_senders.{self.chart_format}'
-            plt.savefig(file_path, bbox_inches='tight', dpi=300)
-            plt.close()
-            
-            logger.info(f"Generated sender chart: {file_path}")
-            return str(file_path)
-        except Exception as e:
-            logger.error(f"Error generating sender chart: {e}")
-            return None
-    
-    def _generate_monthly_chart(self, results: Dict[str, Any], output_dir: Path) -> Optional[str]:
-        """Generate monthly trend line chart."""
-        try:
-            temporal = results.get('temporal_patterns', {})
-            monthly_trends = temporal.get('monthly_trends', {})
-            
-            if not monthly_trends:
-                return None
-            
-            plt.figure(figsize=(14, 6))
-            months = sorted(monthly_trends.keys())
-            counts = [monthly_trends[m] for m in months]
-            
-            plt.plot(months, counts, marker='o', linewidth=2, markersize=8, color='#FF9800')
-            plt.xlabel('Month')
-            plt.ylabel('Number of Emails')
-            plt.title('Email Volume Trend by Month')
-            plt.xticks(rotation=45, ha='right')
-            plt.grid(True, alpha=0.3)
-            
-            file_path = output_dir / f'monthly_trend.{self.chart_format}'
-            plt.savefig(file_path, bbox_inches='tight', dpi=300)
-            plt.close()
-            
-            logger.info(f"Generated monthly chart: {file_path}")
-            return str(file_path)
-        except Exception as e:
-            logger.error(f"Error generating monthly chart: {e}")
-            return None
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(chart_hashes, f)
+            os.replace(tmp_file, hashes_file)
+        except OSError as e:
+            logger.warning(f"Could not save chart hashes: {e}")
@@ -0,0 +1,24 @@
+"""Tests for the Gmail connector."""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from src.gmail_connector import _retry_delay
+
+
+@pytest.mark.parametrize('header, expected', [
+    (None, 4),
+    ('3', 3.0),
+    ('-2', 0.0),
+    ('soon', 4),
+    ('Wed, 21 Oct 2015 07:28:00 GMT', 0.0),
+])
+def test_retry_delay(header, expected):
+    assert _retry_delay(header, 4) == expected
+
+
+def test_retry_delay_http_date_in_future():
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 < _retry_delay(format_datetime(when, usegmt=True), 4) <= 30
@@ -0,0 +1,63 @@
+"""Tests for the pattern detector."""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import pattern_detector
+from src.pattern_detector import PatternDetector, _date_columns
+
+# Dates outside the 1677-2262 range nanosecond timestamps can hold
+OUT_OF_RANGE_DATES = [
+    datetime(1, 1, 1),
+    datetime(1677, 1, 1),
+    datetime(2300, 1, 1, 15, 30),
+    datetime(9999, 12, 31),
+]
+
+
+def _emails(dates):
+    return [
+        {'sender': f'sender{i % 2}@example.com', 'subject': f'Weekly report {i}',
+         'body': '', 'date': date, 'thread_id': f't{i % 2}'}
+        for i, date in enumerate(dates)
+    ]
+
+
+@pytest.fixture(params=[False, True], ids=['pandas', 'fallback'])
+def nanosecond_pandas(request, monkeypatch):
+    """Optionally make pd.to_datetime reject the dates like pandas 2.x does."""
+    if request.param:
+        def to_datetime(*args, **kwargs):
+            raise pd.errors.OutOfBoundsDatetime('Out of bounds nanosecond timestamp')
+        monkeypatch.setattr(pattern_detector.pd, 'to_datetime', to_datetime)
+    return request.param
+
+
+@pytest.mark.parametrize('tz', [None, timezone(timedelta(hours=-5))], ids=['naive', 'aware'])
+def test_date_columns_out_of_range(nanosecond_pandas, tz):
+    dates = [d.replace(tzinfo=tz) for d in OUT_OF_RANGE_DATES[1:3]]
+    instants, local = _date_columns(dates)
+
+    assert local.tolist() == [d.replace(tzinfo=None) for d in dates]
+    expected = [d.astimezone(timezone.utc).replace(tzinfo=None) if tz else d for d in dates]
+    assert instants.tolist() == expected
+
+
+def test_detect_patterns_out_of_range_dates(nanosecond_pandas):
+    emails = _emails(OUT_OF_RANGE_DATES)
+    patterns = PatternDetector().detect_patterns(emails)
+
+    temporal = patterns['temporal']
+    assert temporal['time_of_day']['night']['count'] == 3
+    assert temporal['time_of_day']['afternoon']['count'] == 1
+    workdays = sum(d.weekday() < 5 for d in OUT_OF_RANGE_DATES)
+    assert temporal['workweek_vs_weekend']['workdays']['count'] == workdays
+    assert patterns['volume']['average_daily'] == 1.0
+    assert patterns['thread']['total_threads'] == 2
+
+    frame = PatternDetector._email_columns(emails)
+    assert frame['local'].dtype == np.dtype('datetime64[us]')
+    assert frame['local'].tolist() == OUT_OF_RANGE_DATES